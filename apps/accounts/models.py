@@ -144,6 +144,7 @@ class CustomUser(AbstractUser):
             models.Index(fields=['created_at'], name='user_created_idx'),
             models.Index(fields=['email', 'is_active'], name='user_email_act_idx'),
             models.Index(fields=['firebase_uid'], name='user_firebase_uid_idx'),
+            models.Index(fields=['latitude', 'longitude'], name='user_lat_lon_idx'),
         ]
 
     def __str__(self):
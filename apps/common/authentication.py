@@ -0,0 +1,48 @@
+"""
+JWT authentication that resolves the Driver role together with the user row.
+"""
+from django.db.models import Exists, OuterRef
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class RoleAwareJWTAuthentication(JWTAuthentication):
+    """
+    Same checks as simplejwt's ``JWTAuthentication.get_user``, but the user
+    SELECT also carries ``in_driver_group`` (an EXISTS on the groups through
+    table), so driver-only views can check the role without another query.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        users = self.user_model.objects.annotate(
+            in_driver_group=Exists(
+                self.user_model.groups.through.objects.filter(
+                    customuser_id=OuterRef('pk'), group__name='Driver'
+                )
+            )
+        )
+        try:
+            user = users.get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
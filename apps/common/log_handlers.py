@@ -0,0 +1,53 @@
+"""Logging handlers used by ``settings.LOGGING``."""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import weakref
+from logging.handlers import QueueHandler, QueueListener
+
+# Handlers whose listener thread must be restarted in a forked child.
+_live_handlers = weakref.WeakSet()
+
+
+def _restart_listeners():
+    for handler in list(_live_handlers):
+        handler._start_listener()
+
+
+# Threads don't survive fork (Celery prefork workers): start a fresh
+# queue/listener pair in the child instead of queueing into the void.
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listeners)
+
+
+class QueuedFileHandler(QueueHandler):
+    """
+    File handler whose disk writes happen on a background thread.
+
+    Records are formatted on the calling thread (so the configured formatter
+    applies) and appended to ``filename`` by a ``QueueListener``; request
+    threads and the event loop only enqueue. ``close()`` (called by
+    ``logging.shutdown`` at exit) drains the queue before closing the file.
+    """
+
+    def __init__(self, filename, encoding=None):
+        self._target = logging.FileHandler(filename, encoding=encoding, delay=True)
+        self._listener = None
+        super().__init__(queue.SimpleQueue())
+        self._start_listener()
+        _live_handlers.add(self)
+
+    def _start_listener(self):
+        self.queue = queue.SimpleQueue()
+        self._listener = QueueListener(self.queue, self._target)
+        self._listener.start()
+
+    def close(self):
+        _live_handlers.discard(self)
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self._target.close()
+        super().close()
@@ -0,0 +1,29 @@
+"""orjson-backed JSON renderer (the project-wide default, see REST_FRAMEWORK)."""
+from __future__ import annotations
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# DRF's encoder formats datetimes/Decimal/lazy strings; reuse it so output
+# stays byte-compatible with JSONRenderer for the non-native types.
+_drf_default = JSONEncoder().default
+
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Same media type and ``None`` handling as JSONRenderer, but encodes with
+    orjson (C) instead of the stdlib json module.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        option = _ORJSON_OPTIONS
+        # Browsable API / ``Accept: application/json; indent=N``: orjson only
+        # supports 2-space indentation.
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_drf_default, option=option)
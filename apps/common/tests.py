@@ -0,0 +1,62 @@
+import logging
+import os
+import tempfile
+import unittest
+
+from django.test import SimpleTestCase
+
+from apps.common import log_handlers
+from apps.common.log_handlers import QueuedFileHandler
+
+
+class QueuedFileHandlerTests(SimpleTestCase):
+    """Records reach the file through the listener thread, also after fork."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.log')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        self.handler = QueuedFileHandler(self.path)
+        self.handler.setFormatter(logging.Formatter('%(process)d %(message)s'))
+        self.addCleanup(self.handler.close)
+        self.logger = logging.getLogger(f'{__name__}.{self._testMethodName}')
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def _read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_record_written_by_listener(self):
+        self.logger.warning('parent record')
+        self.handler.close()  # drains the queue
+
+        self.assertEqual(self._read(), f'{os.getpid()} parent record\n')
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_listener_restarted_in_forked_child(self):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                alive = self.handler._listener._thread.is_alive()
+                self.logger.warning('child record')
+                self.handler.close()
+            finally:
+                os._exit(0 if alive else 1)
+        _, wait_status = os.waitpid(pid, 0)
+
+        self.assertEqual(os.waitstatus_to_exitcode(wait_status), 0)
+        self.assertIn(f'{pid} child record\n', self._read())
+        # The parent's listener is untouched by the fork.
+        self.logger.warning('parent record')
+        self.handler.close()
+        self.assertIn(f'{os.getpid()} parent record\n', self._read())
+
+    def test_closed_handler_is_not_restarted(self):
+        self.handler.close()
+        self.assertNotIn(self.handler, log_handlers._live_handlers)
+
+        log_handlers._restart_listeners()
+
+        self.assertIsNone(self.handler._listener)
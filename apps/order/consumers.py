@@ -109,9 +109,14 @@ class DriverOrdersConsumer(AsyncWebsocketConsumer):
             'message': event.get('message', 'Active ride status refreshed'),
         }))
 
-    @database_sync_to_async
-    def _check_driver_role(self, user):
-        return user.groups.filter(name='Driver').exists()
+    async def _check_driver_role(self, user):
+        # Loaded with the user by RoleAwareJWTAuthentication (TokenAuthMiddleware).
+        in_driver_group = getattr(user, 'in_driver_group', None)
+        if in_driver_group is not None:
+            return in_driver_group
+        return await database_sync_to_async(
+            lambda: user.groups.filter(name='Driver').exists()
+        )()
 
     @database_sync_to_async
     def _get_current_orders(self):
@@ -321,9 +326,14 @@ class DriverSurgeZonesConsumer(AsyncWebsocketConsumer):
             "zones": zones,
         }))
 
-    @database_sync_to_async
-    def _check_driver_role(self, user):
-        return user.groups.filter(name="Driver").exists()
+    async def _check_driver_role(self, user):
+        # Loaded with the user by RoleAwareJWTAuthentication (TokenAuthMiddleware).
+        in_driver_group = getattr(user, "in_driver_group", None)
+        if in_driver_group is not None:
+            return in_driver_group
+        return await database_sync_to_async(
+            lambda: user.groups.filter(name="Driver").exists()
+        )()
 
     @database_sync_to_async
     def _get_surge_zones(self):
@@ -0,0 +1,33 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations
+
+
+def backfill_price_range(apps, schema_editor):
+    """Fill min/max price (-20% / +50% of original) on rows created before they were always set."""
+    OrderItem = apps.get_model('order', 'OrderItem')
+    cent = Decimal('0.01')
+    batch = []
+    rows = OrderItem.objects.filter(original_price__isnull=False).exclude(
+        min_price__isnull=False, max_price__isnull=False
+    ).only('id', 'original_price', 'min_price', 'max_price')
+    for item in rows.iterator(chunk_size=1000):
+        item.min_price = (item.original_price * Decimal('0.80')).quantize(cent, rounding=ROUND_HALF_UP)
+        item.max_price = (item.original_price * Decimal('1.50')).quantize(cent, rounding=ROUND_HALF_UP)
+        batch.append(item)
+        if len(batch) >= 1000:
+            OrderItem.objects.bulk_update(batch, ['min_price', 'max_price'])
+            batch = []
+    if batch:
+        OrderItem.objects.bulk_update(batch, ['min_price', 'max_price'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0027_order_user_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_price_range, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0028_backfill_order_item_price_range'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderdriver',
+            index=models.Index(fields=['driver', 'status'], name='order_driver_drv_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+        ),
+    ]
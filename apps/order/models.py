@@ -98,6 +98,8 @@ class Order(models.Model):
             models.Index(fields=['user'], name='order_user_idx'),
             models.Index(fields=['status'], name='order_status_idx'),
             models.Index(fields=['created_at'], name='order_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='order_user_created_id_idx'),
+            models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
         ]
 
 
@@ -290,8 +292,8 @@ class OrderItem(models.Model):
             raise ValueError("Original price not set")
         
         if not self.min_price or not self.max_price:
+            # Persisted together with the adjustment below.
             self.min_price, self.max_price = self.calculate_price_range()
-            self.save()
         
         if self.min_price and new_price < self.min_price:
             raise ValueError(f"Price cannot be less than {self.min_price}")
@@ -306,7 +308,10 @@ class OrderItem(models.Model):
         
         self.calculated_price = self.adjusted_price
         
-        self.save()
+        self.save(update_fields=[
+            'min_price', 'max_price', 'adjusted_price', 'is_price_adjusted',
+            'price_adjustment_percentage', 'calculated_price', 'updated_at',
+        ])
         
         return self.adjusted_price
     
@@ -374,6 +379,10 @@ class OrderItem(models.Model):
         from apps.order.services import SurgePricingService
         
         if self.original_price and not self._state.adding:
+            # Keep the allowed range populated so readers never have to
+            # compute and persist it on the request path.
+            if not self.min_price or not self.max_price:
+                self.min_price, self.max_price = self.calculate_price_range()
             return
         
         if not self.ride_type or not self.distance_km:
@@ -751,6 +760,7 @@ class OrderDriver(models.Model):
             models.Index(fields=['driver'], name='order_driver_driver_idx'),
             models.Index(fields=['status'], name='order_driver_status_idx'),
             models.Index(fields=['created_at'], name='order_driver_created_idx'),
+            models.Index(fields=['driver', 'status'], name='order_driver_drv_status_idx'),
         ]
 
 
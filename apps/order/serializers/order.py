@@ -1,6 +1,8 @@
+import math
+
 from rest_framework import serializers
 from django.db import transaction
-from django.db.models import Avg, Count
+from django.db.models import Avg, Count, Q
 from ..models import (
     Order,
     OrderItem,
@@ -138,12 +140,8 @@ class OrderCreateSerializer(serializers.Serializer):
                 raise serializers.ValidationError(
                     {'adjusted_price': 'Prices not computed; check ride_type and coordinates.'}
                 )
-            if not order_item.min_price or not order_item.max_price:
-                min_p, max_p = order_item.calculate_price_range()
-                order_item.min_price = min_p
-                order_item.max_price = max_p
-                order_item.save(update_fields=['min_price', 'max_price'])
             try:
+                # Fills a missing min/max range and saves it with the adjustment.
                 order_item.adjust_price(float(adjusted_price))
             except ValueError as e:
                 raise serializers.ValidationError({'adjusted_price': str(e)})
@@ -262,6 +260,25 @@ class OrderSerializer(serializers.ModelSerializer):
             'stripe_trip_payment_amount_cents', 'stripe_trip_payment_currency',
         ]
 
+    def _client_stats(self, user_id):
+        """
+        Approved-rating average and tip count for a rider, in one query.
+        Memoized in the serializer context, so a page of the same rider's
+        orders (or many=True lists in general) queries once per rider.
+        """
+        memo = self.context.setdefault('_client_stats', {})
+        stats = memo.get(user_id)
+        if stats is None:
+            stats = TripRating.objects.filter(
+                rider_id=user_id,
+                status='approved',
+            ).aggregate(
+                avg=Avg('rating'),
+                tip_count=Count('id', filter=Q(tip_amount__gt=0)),
+            )
+            memo[user_id] = stats
+        return stats
+
     def get_client_rating(self, obj):
         """
         Average rating (1-5) that drivers have given to this order's rider (user).
@@ -269,11 +286,7 @@ class OrderSerializer(serializers.ModelSerializer):
         """
         if not obj.user_id:
             return None
-        agg = TripRating.objects.filter(
-            rider_id=obj.user_id,
-            status='approved',
-        ).aggregate(avg=Avg('rating'))
-        avg = agg['avg']
+        avg = self._client_stats(obj.user_id)['avg']
         return round(float(avg), 2) if avg is not None else None
 
     def get_client_tip_count(self, obj):
@@ -282,11 +295,7 @@ class OrderSerializer(serializers.ModelSerializer):
         """
         if not obj.user_id:
             return 0
-        return TripRating.objects.filter(
-            rider_id=obj.user_id,
-            status='approved',
-            tip_amount__gt=0,
-        ).count()
+        return self._client_stats(obj.user_id)['tip_count']
 
 
 class OrderDetailSerializer(OrderSerializer):
@@ -318,59 +327,44 @@ class OrderDetailSerializer(OrderSerializer):
         return _order_driver_row(self._accepted_order_driver(obj))
 
 
+_LATITUDE_ERRORS = {
+    'min_value': 'Latitude must be between -90 and 90.',
+    'max_value': 'Latitude must be between -90 and 90.',
+}
+_LONGITUDE_ERRORS = {
+    'min_value': 'Longitude must be between -180 and 180.',
+    'max_value': 'Longitude must be between -180 and 180.',
+}
+
+
 class PriceEstimateSerializer(serializers.Serializer):
     """
-    Serializer for price estimation
+    Serializer for price estimation.
+
+    Coordinates are only used as floats (distance, surge lookup), so they are
+    parsed as FloatField; the range bounds reject invalid GPS (often
+    intermittent from device).
     """
-    latitude_from = serializers.DecimalField(
-        max_digits=24,
-        decimal_places=18,
-        required=True,
-        coerce_to_string=False
+    latitude_from = serializers.FloatField(
+        min_value=-90.0, max_value=90.0, error_messages=_LATITUDE_ERRORS
     )
-    longitude_from = serializers.DecimalField(
-        max_digits=24,
-        decimal_places=18,
-        required=True,
-        coerce_to_string=False
+    longitude_from = serializers.FloatField(
+        min_value=-180.0, max_value=180.0, error_messages=_LONGITUDE_ERRORS
     )
-    latitude_to = serializers.DecimalField(
-        max_digits=24,
-        decimal_places=18,
-        required=True,
-        coerce_to_string=False
+    latitude_to = serializers.FloatField(
+        min_value=-90.0, max_value=90.0, error_messages=_LATITUDE_ERRORS
     )
-    longitude_to = serializers.DecimalField(
-        max_digits=24,
-        decimal_places=18,
-        required=True,
-        coerce_to_string=False
+    longitude_to = serializers.FloatField(
+        min_value=-180.0, max_value=180.0, error_messages=_LONGITUDE_ERRORS
     )
 
     def validate(self, data):
-        """
-        Reject invalid GPS (often intermittent from device); avoids odd distance/price edge cases.
-        """
-        lat_from = float(data['latitude_from'])
-        lon_from = float(data['longitude_from'])
-        lat_to = float(data['latitude_to'])
-        lon_to = float(data['longitude_to'])
-        if not (-90.0 <= lat_from <= 90.0):
-            raise serializers.ValidationError(
-                {'latitude_from': 'Latitude must be between -90 and 90.'}
-            )
-        if not (-90.0 <= lat_to <= 90.0):
-            raise serializers.ValidationError(
-                {'latitude_to': 'Latitude must be between -90 and 90.'}
-            )
-        if not (-180.0 <= lon_from <= 180.0):
-            raise serializers.ValidationError(
-                {'longitude_from': 'Longitude must be between -180 and 180.'}
-            )
-        if not (-180.0 <= lon_to <= 180.0):
-            raise serializers.ValidationError(
-                {'longitude_to': 'Longitude must be between -180 and 180.'}
-            )
+        # NaN compares false against both bounds, so the range validators let it through.
+        for name in ('latitude_from', 'longitude_from', 'latitude_to', 'longitude_to'):
+            if not math.isfinite(data[name]):
+                raise serializers.ValidationError(
+                    {name: self.fields[name].error_messages['min_value']}
+                )
         return data
 
 
@@ -12,6 +12,10 @@ class RatingFeedbackTagSerializer(serializers.ModelSerializer):
 class TripRatingCreateSerializer(serializers.Serializer):
     """
     Serializer for creating a trip rating.
+
+    Field-level checks only. Order state (exists, completed, not yet rated)
+    and feedback tag validity are checked in TripRatingCreateView against
+    the order/tag rows it loads anyway.
     """
     
     order_id = serializers.IntegerField(required=True, help_text="ID of the completed order")
@@ -41,55 +45,6 @@ class TripRatingCreateSerializer(serializers.Serializer):
         allow_empty=True,
         help_text="List of feedback tag IDs to associate with this rating"
     )
-    
-    def validate_order_id(self, value):
-        """
-        Validate that order exists and belongs to the user.
-        """
-        try:
-            order = Order.objects.get(id=value)
-        except Order.DoesNotExist:
-            raise serializers.ValidationError("Order not found.")
-        
-        # Check if order is completed
-        if order.status != Order.OrderStatus.COMPLETED:
-            raise serializers.ValidationError("Can only rate completed orders.")
-        
-        # Check if rating already exists
-        if hasattr(order, 'trip_rating'):
-            raise serializers.ValidationError("This order has already been rated.")
-        
-        return value
-    
-    def validate_feedback_tag_ids(self, value):
-        """
-        Validate that feedback tags exist and match the rating type.
-        """
-        if not value:
-            return value
-        
-        # Get rating value from initial data
-        rating = self.initial_data.get('rating')
-        if not rating:
-            return value
-        
-        # Determine expected tag type based on rating
-        expected_tag_type = 'positive' if rating >= 4 else 'negative'
-        
-        tags = RatingFeedbackTag.objects.filter(
-            id__in=value, is_active=True, rating_target='rider_to_driver'
-        )
-        if tags.count() != len(value):
-            raise serializers.ValidationError(
-                "Some feedback tags are invalid, inactive, or not for rider→driver rating."
-            )
-        for tag in tags:
-            if tag.tag_type != expected_tag_type:
-                raise serializers.ValidationError(
-                    f"Tag '{tag.name}' is {tag.get_tag_type_display()} but rating is {rating} stars. "
-                    f"Use {'positive' if rating >= 4 else 'negative'} tags for {rating} star rating."
-                )
-        return value
 
 
 class TripRatingSerializer(serializers.ModelSerializer):
@@ -2,7 +2,7 @@ import logging
 from django.utils import timezone
 from datetime import timedelta
 from math import radians, cos, sin, asin, sqrt
-from django.db.models import Prefetch
+from django.db.models import Prefetch, Q
 from apps.accounts.models import CustomUser, DriverPreferences, VehicleDetails
 from apps.order.models import Order, OrderItem, OrderDriver, RideType
 
@@ -22,12 +22,31 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     return c * r
 
 
+def bounding_box(lat, lon, radius_km):
+    """
+    Lat/lon box enclosing a circle of ``radius_km`` around (lat, lon).
+    Lets the DB prefilter candidates on the (latitude, longitude) index
+    before the exact haversine check.
+    """
+    lat_delta = radius_km / 111.32
+    lon_delta = radius_km / (111.32 * max(cos(radians(lat)), 0.01))
+    return lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta
+
+
 class DriverAssignmentService:
     
     TIMEOUT_SECONDS = 20
     SEARCH_RADIUSES = [5.0, 10.0, 15.0, 20.0]
     WAIT_BETWEEN_RADIUSES = 10
     MAX_DESTINATION_DISTANCE_KM = 3.0
+    # Order statuses that keep an accepted driver busy with that trip.
+    ACTIVE_ORDER_STATUSES = (
+        Order.OrderStatus.PENDING,
+        Order.OrderStatus.ACCEPTED,
+        Order.OrderStatus.ON_THE_WAY,
+        Order.OrderStatus.ARRIVED,
+        Order.OrderStatus.IN_PROGRESS,
+    )
     
     @staticmethod
     def _is_driver_available(driver, new_order_pickup_lat=None, new_order_pickup_lon=None):
@@ -40,13 +59,7 @@ class DriverAssignmentService:
             ).select_related('order').prefetch_related('order__order_items')
         
         for order_driver in active_order_drivers:
-            if order_driver.order.status in [
-                Order.OrderStatus.PENDING,
-                Order.OrderStatus.ACCEPTED,
-                Order.OrderStatus.ON_THE_WAY,
-                Order.OrderStatus.ARRIVED,
-                Order.OrderStatus.IN_PROGRESS,
-            ]:
+            if order_driver.order.status in DriverAssignmentService.ACTIVE_ORDER_STATUSES:
                 if new_order_pickup_lat and new_order_pickup_lon:
                     current_order = order_driver.order
                     if hasattr(current_order, 'order_items'):
@@ -78,6 +91,35 @@ class DriverAssignmentService:
         
         return True, None, False
     
+    @staticmethod
+    def _candidate_drivers(driver_group, pickup_lat, pickup_lon, exclude_driver_ids, max_radius_km=None):
+        """
+        Online drivers with a known position. With ``max_radius_km``, only
+        those inside its bounding box, plus drivers on an active trip, who may
+        match via their trip's destination wherever they are now.
+        """
+        drivers = CustomUser.objects.filter(
+            groups=driver_group,
+            is_active=True,
+            is_online=True,
+            latitude__isnull=False,
+            longitude__isnull=False
+        ).exclude(id__in=exclude_driver_ids)
+        if max_radius_km is None:
+            return drivers
+        # Accepted rows stay ACCEPTED after completion, so the order status is
+        # what marks the trip as active. The ids come from a subquery rather
+        # than a join so the box stays a plain range on user_lat_lon_idx.
+        on_active_trip = OrderDriver.objects.filter(
+            status=OrderDriver.DriverRequestStatus.ACCEPTED,
+            order__status__in=DriverAssignmentService.ACTIVE_ORDER_STATUSES,
+        ).values('driver_id')
+        min_lat, max_lat, min_lon, max_lon = bounding_box(pickup_lat, pickup_lon, max_radius_km)
+        return drivers.filter(
+            Q(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+            | Q(id__in=on_active_trip)
+        )
+
     @staticmethod
     def find_nearest_available_driver(order, exclude_driver_ids=None, max_radius_km=None):
         if exclude_driver_ids is None:
@@ -93,13 +135,9 @@ class DriverAssignmentService:
         from django.contrib.auth.models import Group
         try:
             driver_group = Group.objects.get(name='Driver')
-            all_drivers = CustomUser.objects.filter(
-                groups=driver_group,
-                is_active=True,
-                is_online=True,
-                latitude__isnull=False,
-                longitude__isnull=False
-            ).exclude(id__in=exclude_driver_ids).prefetch_related(
+            all_drivers = DriverAssignmentService._candidate_drivers(
+                driver_group, pickup_lat, pickup_lon, exclude_driver_ids, max_radius_km
+            ).prefetch_related(
                 Prefetch(
                     'vehicle_details',
                     queryset=VehicleDetails.objects.all(),
@@ -271,6 +309,15 @@ class DriverAssignmentService:
                 exc_info=True,
             )
 
+        try:
+            from apps.order.tasks import expire_order_driver_request
+            expire_order_driver_request.apply_async(
+                args=[order_driver.id, order_driver.requested_at.isoformat()],
+                countdown=DriverAssignmentService.TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"Failed to schedule timeout for order {order.id} driver {driver.id}: {e}")
+
         try:
             from .driver_orders_websocket import send_new_order_to_driver
             send_new_order_to_driver(order, driver, order_driver.requested_at)
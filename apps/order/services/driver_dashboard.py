@@ -1,12 +1,14 @@
 """Driver dashboard: overview, cash_history, ride_history. Filters: day, week, last_30, range."""
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from decimal import Decimal
+from functools import lru_cache
 
-from django.db.models import Sum
+from django.core.cache import cache
+from django.db.models import Count, Prefetch, Q, Sum
 from django.utils import timezone
 
 from apps.accounts.models import CustomUser
-from ..models import Order, OrderDriver, TripRating
+from ..models import Order, OrderDriver, OrderItem, TripRating
 
 
 def _parse_filter(filter_type, start_date, end_date):
@@ -24,7 +26,6 @@ def _parse_filter(filter_type, start_date, end_date):
     if filter_type == 'last_30':
         return today - timedelta(days=30), now
     if filter_type == 'range' and start_date and end_date:
-        from datetime import datetime
         try:
             start = datetime.strptime(str(start_date)[:10], '%Y-%m-%d')
             end = datetime.strptime(str(end_date)[:10], '%Y-%m-%d')
@@ -37,6 +38,18 @@ def _parse_filter(filter_type, start_date, end_date):
     return today - timedelta(days=30), now
 
 
+def _with_ride_history_relations(qs):
+    """
+    Load everything OrderSerializer touches up front: user (+ groups for
+    UserDetailSerializer), saved_card, and items joined to their ride type.
+    Without this each row costs extra queries for saved_card and groups.
+    """
+    return qs.select_related('user', 'saved_card').prefetch_related(
+        'user__groups',
+        Prefetch('order_items', queryset=OrderItem.objects.select_related('ride_type')),
+    )
+
+
 def get_driver_dashboard(user_id, ride_limit=10, filter_type='last_30', start_date=None, end_date=None):
     """Returns (overview, cash_history, ride_history). All filtered by date."""
     user = CustomUser.objects.get(id=user_id)
@@ -46,27 +59,22 @@ def get_driver_dashboard(user_id, ride_limit=10, filter_type='last_30', start_da
         order_drivers__driver=user,
         order_drivers__status=OrderDriver.DriverRequestStatus.ACCEPTED,
         status=Order.OrderStatus.COMPLETED,
-    ).prefetch_related('order_items')
+    )
 
     orders_qs = base.filter(updated_at__gte=dt_start, updated_at__lte=dt_end)
 
-    def _sum_price(qs):
-        total = Decimal('0')
-        for o in qs:
-            for i in o.order_items.all():
-                if i.calculated_price:
-                    total += Decimal(str(i.calculated_price))
-        return total
-
-    order_list = list(orders_qs)
-    earnings = _sum_price(order_list)
+    totals = orders_qs.aggregate(
+        earnings=Sum('order_items__calculated_price'),
+        rides=Count('id', distinct=True),
+    )
+    earnings = totals['earnings'] or Decimal('0')
     tip_val = TripRating.objects.filter(
         driver=user, status='approved',
         order__updated_at__gte=dt_start, order__updated_at__lte=dt_end
     ).aggregate(s=Sum('tip_amount'))['s'] or Decimal('0')
 
     overview_item = {
-        'rides': len(order_list),
+        'rides': totals['rides'],
         'made_in_today': float(earnings),
         'made_in_week': float(earnings),
         'tip': float(tip_val),
@@ -81,9 +89,9 @@ def get_driver_dashboard(user_id, ride_limit=10, filter_type='last_30', start_da
     except Exception:
         cash_history = []
 
-    ride_orders = list(base.filter(
+    ride_orders = list(_with_ride_history_relations(base.filter(
         updated_at__gte=dt_start, updated_at__lte=dt_end
-    ).select_related('user').prefetch_related('order_items__ride_type').order_by('-updated_at')[:ride_limit])
+    )).order_by('-updated_at')[:ride_limit])
     from ..serializers.order import OrderSerializer
     ride_history = OrderSerializer(ride_orders, many=True).data
 
@@ -99,73 +107,61 @@ def get_cash_history(user_id, filter_type='last_30', start_date=None, end_date=N
     return data['results'], data['count']
 
 
-def _completed_orders_for_driver(user):
+def _completed_orders_for_driver(user_id):
     return Order.objects.filter(
-        order_drivers__driver=user,
+        order_drivers__driver_id=user_id,
         order_drivers__status=OrderDriver.DriverRequestStatus.ACCEPTED,
         status=Order.OrderStatus.COMPLETED,
-    ).prefetch_related('order_items')
+    )
 
 
-def _earnings_stats_for_period(user, dt_start, dt_end):
-    """Sum earnings (calculated_price), ride count, distance (distance_km) for completed trips in [dt_start, dt_end]."""
-    qs = _completed_orders_for_driver(user).filter(
-        updated_at__gte=dt_start,
-        updated_at__lte=dt_end,
-    )
-    total_earnings = Decimal('0')
-    total_distance = Decimal('0')
-    rides = 0
-    for o in qs:
-        rides += 1
-        for i in o.order_items.all():
-            if i.calculated_price:
-                total_earnings += Decimal(str(i.calculated_price))
-            if i.distance_km is not None:
-                total_distance += Decimal(str(i.distance_km))
-    return total_earnings, rides, total_distance
+EARNINGS_CACHE_SECONDS = 60
+
+
+@lru_cache(maxsize=8)
+def _earnings_cutoffs(bucket_minute):
+    """(today_start, week_start, month_start) for the UTC minute ``bucket_minute``."""
+    now = datetime.fromtimestamp(bucket_minute * 60, tz=dt_timezone.utc)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return today_start, today_start - timedelta(days=7), today_start.replace(day=1)
+
+
+def _driver_earnings_stats(user_id, bucket_minute):
+    today_start, week_start, month_start = _earnings_cutoffs(bucket_minute)
+    periods = {
+        'today': Q(updated_at__gte=today_start),
+        'weekly': Q(updated_at__gte=week_start),
+        'monthly': Q(updated_at__gte=month_start),
+        'total': None,
+    }
+    aggregates = {}
+    for name, period in periods.items():
+        aggregates[f'{name}_earnings'] = Sum('order_items__calculated_price', filter=period)
+        aggregates[f'{name}_distance_km'] = Sum('order_items__distance_km', filter=period)
+        aggregates[f'{name}_rides_count'] = Count('id', filter=period, distinct=True)
+
+    stats = _completed_orders_for_driver(user_id).aggregate(**aggregates)
+    for name in periods:
+        stats[f'{name}_earnings'] = stats[f'{name}_earnings'] or Decimal('0')
+        stats[f'{name}_distance_km'] = stats[f'{name}_distance_km'] or Decimal('0')
+    return stats
 
 
 def get_driver_earnings(user_id, today_target=10):
     """
     Stats for DriverEarningsSerializer: today, rolling 7-day week, calendar month-to-date, all-time.
     ``today_target`` is a UI goal (no DB field yet); default 10 rides.
+    All periods are computed in one aggregate query (conditional Sum/Count);
+    the result is cached per driver for the current minute, so a polling
+    app hits the database at most once a minute.
     """
-    user = CustomUser.objects.get(id=user_id)
-    now = timezone.now()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_start = today_start - timedelta(days=7)
-    month_start = today_start.replace(day=1)
-
-    t_earn, t_rides, t_dist = _earnings_stats_for_period(user, today_start, now)
-    w_earn, w_rides, w_dist = _earnings_stats_for_period(user, week_start, now)
-    m_earn, m_rides, m_dist = _earnings_stats_for_period(user, month_start, now)
-
-    qs_all = _completed_orders_for_driver(user)
-    total_earn, total_rides, total_dist = Decimal('0'), 0, Decimal('0')
-    for o in qs_all:
-        total_rides += 1
-        for i in o.order_items.all():
-            if i.calculated_price:
-                total_earn += Decimal(str(i.calculated_price))
-            if i.distance_km is not None:
-                total_dist += Decimal(str(i.distance_km))
-
-    return {
-        'today_earnings': t_earn,
-        'today_rides_count': t_rides,
-        'today_distance_km': t_dist,
-        'today_target': int(today_target),
-        'weekly_earnings': w_earn,
-        'weekly_rides_count': w_rides,
-        'weekly_distance_km': w_dist,
-        'monthly_earnings': m_earn,
-        'monthly_rides_count': m_rides,
-        'monthly_distance_km': m_dist,
-        'total_earnings': total_earn,
-        'total_rides_count': total_rides,
-        'total_distance_km': total_dist,
-    }
+    bucket_minute = int(timezone.now().timestamp() // 60)
+    stats = cache.get_or_set(
+        f'driver_earnings:{user_id}:{bucket_minute}',
+        lambda: _driver_earnings_stats(user_id, bucket_minute),
+        EARNINGS_CACHE_SECONDS,
+    )
+    return {**stats, 'today_target': int(today_target)}
 
 
 def get_ride_history(user_id, filter_type='last_30', start_date=None, end_date=None, page=1, page_size=10):
@@ -173,12 +169,12 @@ def get_ride_history(user_id, filter_type='last_30', start_date=None, end_date=N
     user = CustomUser.objects.get(id=user_id)
     dt_start, dt_end = _parse_filter(filter_type, start_date, end_date)
 
-    base = Order.objects.filter(
+    base = _with_ride_history_relations(Order.objects.filter(
         order_drivers__driver=user,
         order_drivers__status=OrderDriver.DriverRequestStatus.ACCEPTED,
         status=Order.OrderStatus.COMPLETED,
         updated_at__gte=dt_start, updated_at__lte=dt_end,
-    ).select_related('user').prefetch_related('order_items__ride_type').order_by('-updated_at')
+    )).order_by('-updated_at')
     total = base.count()
     start = (page - 1) * page_size
     orders = list(base[start : start + page_size])
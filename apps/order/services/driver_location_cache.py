@@ -0,0 +1,171 @@
+"""
+Redis-backed driver location cache.
+
+Location pings land in Redis (hash + geo set) and are written back to
+``CustomUser.latitude/longitude`` in batches by ``flush_driver_locations``.
+"""
+import logging
+from datetime import datetime
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+DRIVER_LOCATION_KEY = 'driver:loc:{driver_id}'
+DRIVER_GEO_KEY = 'drivers:geo'
+DIRTY_DRIVERS_KEY = 'drivers:loc:dirty'
+FLUSHING_DRIVERS_KEY = 'drivers:loc:flushing'
+
+_async_client = None
+_sync_client = None
+
+
+def _client_options():
+    return {
+        'decode_responses': True,
+        'socket_connect_timeout': settings.DRIVER_LOCATION_REDIS_CONNECT_TIMEOUT,
+        'socket_timeout': settings.DRIVER_LOCATION_REDIS_SOCKET_TIMEOUT,
+    }
+
+
+def _get_async_client():
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(
+            settings.DRIVER_LOCATION_REDIS_URL, **_client_options()
+        )
+    return _async_client
+
+
+def _get_sync_client():
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(
+            settings.DRIVER_LOCATION_REDIS_URL, **_client_options()
+        )
+    return _sync_client
+
+
+def _location_from_hash(raw):
+    if not raw:
+        return None
+    return {
+        'latitude': raw['lat'],
+        'longitude': raw['lon'],
+        'updated_at': datetime.fromisoformat(raw['ts']),
+    }
+
+
+async def store_driver_location(driver_id: int, latitude, longitude, updated_at: datetime):
+    """Record the latest position and mark the driver for the next DB flush."""
+    key = DRIVER_LOCATION_KEY.format(driver_id=driver_id)
+    client = _get_async_client()
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.hset(key, mapping={
+            'lat': str(latitude),
+            'lon': str(longitude),
+            'ts': updated_at.isoformat(),
+        })
+        pipe.expire(key, settings.DRIVER_LOCATION_TTL_SECONDS)
+        pipe.geoadd(DRIVER_GEO_KEY, (float(longitude), float(latitude), driver_id))
+        pipe.sadd(DIRTY_DRIVERS_KEY, driver_id)
+        await pipe.execute()
+
+
+async def get_driver_location(driver_id: int):
+    """
+    Return ``{'latitude', 'longitude', 'updated_at'}`` from Redis, or None
+    when nothing is cached (expired, never pinged, or Redis unavailable).
+    """
+    try:
+        raw = await _get_async_client().hgetall(DRIVER_LOCATION_KEY.format(driver_id=driver_id))
+    except Exception as e:
+        logger.warning('Driver location cache read failed for driver %s: %s', driver_id, e)
+        return None
+    return _location_from_hash(raw)
+
+
+def get_driver_location_sync(driver_id: int):
+    """Blocking twin of ``get_driver_location`` for sync code (services, serializers)."""
+    try:
+        raw = _get_sync_client().hgetall(DRIVER_LOCATION_KEY.format(driver_id=driver_id))
+    except Exception as e:
+        logger.warning('Driver location cache read failed for driver %s: %s', driver_id, e)
+        return None
+    return _location_from_hash(raw)
+
+
+def _location_or_db(user, location):
+    if location:
+        return location
+    return {
+        'latitude': user.latitude,
+        'longitude': user.longitude,
+        'updated_at': user.updated_at,
+    }
+
+
+def resolve_driver_location(user):
+    """
+    Latest known position of ``user`` (a CustomUser row): the cached ping if
+    there is one, else the DB columns, which lag by up to
+    DRIVER_LOCATION_FLUSH_SECONDS. Anything that shows or measures a driver's
+    position should read through this rather than ``user.latitude``.
+    """
+    return _location_or_db(user, get_driver_location_sync(user.id))
+
+
+async def aresolve_driver_location(user):
+    """Async ``resolve_driver_location``."""
+    return _location_or_db(user, await get_driver_location(user.id))
+
+
+async def discard_driver_location(driver_id: int):
+    """
+    Drop the cached position (used when a ping had to go straight to the DB),
+    so readers and the next flush fall back to the fresher DB row.
+    """
+    await _get_async_client().delete(DRIVER_LOCATION_KEY.format(driver_id=driver_id))
+
+
+def flush_driver_locations():
+    """
+    Write cached positions of all drivers pinged since the last flush back
+    to the database with a single bulk UPDATE. Returns the number of rows.
+    """
+    from apps.accounts.models import CustomUser
+
+    client = _get_sync_client()
+    # A leftover flushing set means the previous run failed; retry it first.
+    if not client.exists(FLUSHING_DRIVERS_KEY):
+        try:
+            client.rename(DIRTY_DRIVERS_KEY, FLUSHING_DRIVERS_KEY)
+        except redis.ResponseError:
+            # No drivers pinged since the last run.
+            return 0
+
+    driver_ids = [int(i) for i in client.smembers(FLUSHING_DRIVERS_KEY)]
+    pipe = client.pipeline(transaction=False)
+    for driver_id in driver_ids:
+        pipe.hgetall(DRIVER_LOCATION_KEY.format(driver_id=driver_id))
+    rows = pipe.execute()
+
+    users = []
+    for driver_id, raw in zip(driver_ids, rows):
+        if not raw:
+            continue
+        users.append(CustomUser(
+            id=driver_id,
+            latitude=raw['lat'],
+            longitude=raw['lon'],
+            updated_at=datetime.fromisoformat(raw['ts']) if raw.get('ts') else timezone.now(),
+        ))
+
+    if users:
+        CustomUser.objects.bulk_update(users, ['latitude', 'longitude', 'updated_at'], batch_size=500)
+    client.delete(FLUSHING_DRIVERS_KEY)
+    return len(users)
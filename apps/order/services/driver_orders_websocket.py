@@ -7,6 +7,7 @@ import logging
 from asgiref.sync import async_to_sync
 from django.utils import timezone
 from django.db.models import Avg, Count, Q
+from .driver_location_cache import resolve_driver_location
 from .rider_orders_websocket import _media_absolute_url
 
 from ..models import TripRating
@@ -27,6 +28,7 @@ def get_driver_current_orders(driver):
         status=OrderDriver.DriverRequestStatus.REQUESTED
     ).select_related('order', 'order__user').prefetch_related('order__order_items__ride_type')
 
+    location = resolve_driver_location(driver)
     orders_data = []
     for order_driver in order_drivers:
         order = order_driver.order
@@ -36,16 +38,17 @@ def get_driver_current_orders(driver):
             elapsed = (timezone.now() - order_driver.requested_at).total_seconds()
             if elapsed >= DriverAssignmentService.TIMEOUT_SECONDS:
                 continue  # Skip timed out - Celery will handle
-        order_dict = _order_to_dict(order, driver, order_driver.requested_at)
+        order_dict = _order_to_dict(order, driver, order_driver.requested_at, location)
         if order_dict:
             orders_data.append(order_dict)
     return orders_data
 
 
-def _order_to_dict(order, driver=None, requested_at=None):
+def _order_to_dict(order, driver=None, requested_at=None, driver_location=None):
     """
     Build order dict for WebSocket.
     Includes: vaqt (time), client (rider) info, net_price.
+    ``driver_location`` is the driver's ``resolve_driver_location`` result.
     """
     first_item = order.order_items.first()
     if not first_item:
@@ -136,10 +139,12 @@ def _order_to_dict(order, driver=None, requested_at=None):
         'client_tip_count': client_tip_count,
     }
 
-    if driver and driver.latitude and driver.longitude and first_item.latitude_from and first_item.longitude_from:
+    driver_lat = driver_location['latitude'] if driver_location else None
+    driver_lon = driver_location['longitude'] if driver_location else None
+    if driver_lat and driver_lon and first_item.latitude_from and first_item.longitude_from:
         from .surge_pricing_service import calculate_distance
         distance = calculate_distance(
-            float(driver.latitude), float(driver.longitude),
+            float(driver_lat), float(driver_lon),
             float(first_item.latitude_from), float(first_item.longitude_from)
         )
         result['distance_to_pickup_km'] = round(float(distance), 2)
@@ -158,7 +163,7 @@ def send_new_order_to_driver(order, driver, requested_at=None):
         if not channel_layer:
             return
 
-        order_data = _order_to_dict(order, driver, requested_at)
+        order_data = _order_to_dict(order, driver, requested_at, resolve_driver_location(driver))
         if not order_data:
             return
 
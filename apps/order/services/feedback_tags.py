@@ -0,0 +1,45 @@
+"""
+Cached lists of active RatingFeedbackTag rows, one entry per
+(tag_type, rating_target) pair, shared by all workers through the Django
+cache. Admin saves/deletes drop every entry (see ``apps.order.signals``),
+since an edit can move a tag from one list to another.
+"""
+from django.core.cache import cache
+
+FEEDBACK_TAGS_CACHE_KEY = 'feedback_tags_v1:{tag_type}:{rating_target}'
+FEEDBACK_TAGS_CACHE_SECONDS = 300
+
+
+def _cache_key(tag_type, rating_target):
+    return FEEDBACK_TAGS_CACHE_KEY.format(tag_type=tag_type, rating_target=rating_target)
+
+
+def _load_feedback_tags(tag_type, rating_target):
+    from ..models import RatingFeedbackTag
+    from ..serializers.rating import RatingFeedbackTagSerializer
+
+    tags = RatingFeedbackTag.objects.filter(
+        tag_type=tag_type, rating_target=rating_target, is_active=True
+    ).order_by('name')
+    return [dict(row) for row in RatingFeedbackTagSerializer(tags, many=True).data]
+
+
+def get_feedback_tags(tag_type, rating_target):
+    """Serialized active tags for ``tag_type``/``rating_target``, ordered by name."""
+    rows = cache.get_or_set(
+        _cache_key(tag_type, rating_target),
+        lambda: _load_feedback_tags(tag_type, rating_target),
+        FEEDBACK_TAGS_CACHE_SECONDS,
+    )
+    # Callers get their own copy to modify.
+    return [dict(row) for row in rows]
+
+
+def clear_feedback_tags_cache():
+    from ..models import RatingFeedbackTag
+
+    cache.delete_many([
+        _cache_key(tag_type, rating_target)
+        for tag_type in RatingFeedbackTag.TagType.values
+        for rating_target in RatingFeedbackTag.RatingTarget.values
+    ])
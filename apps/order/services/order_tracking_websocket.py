@@ -7,6 +7,7 @@ from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
 from ..models import Order, OrderDriver
+from .driver_location_cache import resolve_driver_location
 from .surge_pricing_service import calculate_distance
 
 logger = logging.getLogger(__name__)
@@ -185,15 +186,17 @@ def get_initial_tracking_payload(order_id: int):
         "dest_lon": float(first_item.longitude_to) if first_item and first_item.longitude_to is not None else None,
     }
 
-    driver_lat = float(driver.latitude) if driver.latitude is not None else None
-    driver_lon = float(driver.longitude) if driver.longitude is not None else None
+    location = resolve_driver_location(driver)
+    lat, lon, updated_at = location["latitude"], location["longitude"], location["updated_at"]
+    driver_lat = float(lat) if lat is not None else None
+    driver_lon = float(lon) if lon is not None else None
     eta_payload = _build_eta_payload(order.status, driver_lat, driver_lon, meta)
 
     return {
         "order_id": order_id,
         "driver_id": driver.id,
-        "latitude": str(driver.latitude) if driver.latitude is not None else None,
-        "longitude": str(driver.longitude) if driver.longitude is not None else None,
-        "updated_at": driver.updated_at.isoformat() if driver.updated_at else None,
+        "latitude": str(lat) if lat is not None else None,
+        "longitude": str(lon) if lon is not None else None,
+        "updated_at": updated_at.isoformat() if updated_at else None,
         **eta_payload,
     }
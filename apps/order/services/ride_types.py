@@ -0,0 +1,33 @@
+"""
+Cached list of active RideType rows for price estimates.
+
+Ride types are edited from the admin, so the ``.values()`` rows are kept in
+the Django cache. Saves/deletes drop the entry (see ``apps.order.signals``);
+the TTL bounds staleness for caches not shared between processes.
+"""
+from django.core.cache import cache
+
+RIDE_TYPES_CACHE_KEY = 'active_ride_types_v1'
+RIDE_TYPES_CACHE_SECONDS = 300
+
+
+async def get_active_ride_types():
+    """Active ride types as plain dicts, ordered by ``sort_order``, ``id``."""
+    from ..models import RideType
+
+    rows = await cache.aget(RIDE_TYPES_CACHE_KEY)
+    if rows is None:
+        rows = [
+            row async for row in RideType.objects.filter(is_active=True).order_by(
+                'sort_order', 'id'
+            ).values(
+                'id', 'name', 'name_large', 'icon', 'sort_order', 'base_price',
+                'price_per_km', 'capacity', 'is_premium', 'is_ev',
+            )
+        ]
+        await cache.aset(RIDE_TYPES_CACHE_KEY, rows, RIDE_TYPES_CACHE_SECONDS)
+    return rows
+
+
+def clear_ride_types_cache():
+    cache.delete(RIDE_TYPES_CACHE_KEY)
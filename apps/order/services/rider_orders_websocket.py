@@ -13,6 +13,7 @@ from django.db.models import Avg
 from django.utils import timezone
 
 from ..models import Order, OrderDriver, PromoCode, TripRating
+from .driver_location_cache import resolve_driver_location
 
 logger = logging.getLogger(__name__)
 
@@ -154,9 +155,10 @@ def _order_discount_payload(order):
         )
 
     if promo_rows:
-        total_discount = sum(Decimal(str(r.discount_amount)) for r in promo_rows)
-        trip_fare = Decimal(str(promo_rows[0].order_amount_before_discount))
-        total_paid = Decimal(str(promo_rows[-1].order_amount_after_discount))
+        # DecimalField values are already Decimal; no str() round trip needed.
+        total_discount = sum((r.discount_amount for r in promo_rows), Decimal('0'))
+        trip_fare = promo_rows[0].order_amount_before_discount
+        total_paid = promo_rows[-1].order_amount_after_discount
         primary = promo_rows[-1].promo_code
         label = None
         if primary and primary.discount_type == PromoCode.DiscountType.PERCENTAGE:
@@ -182,16 +184,16 @@ def _order_discount_payload(order):
         calc = it.calculated_price
         adj = it.adjusted_price
         if orig is not None:
-            base = Decimal(str(orig))
+            base = orig
         elif calc is not None:
-            base = Decimal(str(calc))
+            base = calc
         else:
             base = Decimal('0')
         trip_fare += base
         if adj is not None:
-            total_paid += Decimal(str(adj))
+            total_paid += adj
         elif calc is not None:
-            total_paid += Decimal(str(calc))
+            total_paid += calc
         else:
             total_paid += base
     raw_delta = trip_fare - total_paid
@@ -304,6 +306,7 @@ def build_driver_for_rider(driver_user, request=None):
         .first()
     )
     stats = _driver_rider_profile_stats(driver_user)
+    location = resolve_driver_location(driver_user)
     return {
         'id': driver_user.id,
         'email': driver_user.email or '',
@@ -316,8 +319,8 @@ def build_driver_for_rider(driver_user, request=None):
             driver_user.avatar.url if driver_user.avatar else None,
             request=request,
         ),
-        'latitude': str(driver_user.latitude) if driver_user.latitude is not None else None,
-        'longitude': str(driver_user.longitude) if driver_user.longitude is not None else None,
+        'latitude': str(location['latitude']) if location['latitude'] is not None else None,
+        'longitude': str(location['longitude']) if location['longitude'] is not None else None,
         'is_online': driver_user.is_online,
         'rating': stats['rating'],
         'trips_count': stats['trips_count'],
@@ -12,17 +12,18 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     Using Haversine formula
     """
     # Convert decimal degrees to radians
-    lat1, lon1, lat2, lon2 = map(radians, [float(lat1), float(lon1), float(lat2), float(lon2)])
-    
-    # Haversine formula
+    lat1 = radians(float(lat1))
+    lat2 = radians(float(lat2))
     dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    dlon = radians(float(lon2)) - radians(float(lon1))
+
+    # Haversine formula
+    a = sin(dlat * 0.5) ** 2 + cos(lat1) * cos(lat2) * sin(dlon * 0.5) ** 2
     c = 2 * asin(sqrt(a))
-    
+
     # Radius of earth in kilometers
     r = 6371
-    
+
     return c * r
 
 
@@ -3,7 +3,9 @@ from channels.layers import get_channel_layer
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
-from .models import SurgePricing
+from .models import RatingFeedbackTag, RideType, SurgePricing
+from .services.feedback_tags import clear_feedback_tags_cache
+from .services.ride_types import clear_ride_types_cache
 
 
 def _build_surge_zones_payload():
@@ -54,3 +56,14 @@ def surge_pricing_saved(sender, **kwargs):
 def surge_pricing_deleted(sender, **kwargs):
     _broadcast_surge_zones()
 
+
+@receiver(post_save, sender=RatingFeedbackTag)
+@receiver(post_delete, sender=RatingFeedbackTag)
+def rating_feedback_tag_changed(sender, **kwargs):
+    clear_feedback_tags_cache()
+
+
+@receiver(post_save, sender=RideType)
+@receiver(post_delete, sender=RideType)
+def ride_type_changed(sender, **kwargs):
+    clear_ride_types_cache()
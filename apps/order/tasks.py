@@ -1,4 +1,6 @@
 import logging
+from datetime import datetime, timedelta
+
 from celery import shared_task
 from django.utils import timezone
 from apps.accounts.models import CustomUser
@@ -14,71 +16,117 @@ from apps.order.services.active_ride import (
 logger = logging.getLogger(__name__)
 
 
+def _expire_order_driver(order_driver_id, order_id, driver_id, requested_at):
+    """
+    Mark one driver request as timed out and hand the order to the next driver.
+
+    The status flip is a conditional UPDATE on (still requested, same
+    requested_at, order still pending), so the scheduled task and the
+    safety-net sweep can't both expire the same request, and a request that
+    was re-sent to the driver in the meantime is left alone.
+    Returns None when nothing was expired, else whether it was reassigned.
+    """
+    expired = OrderDriver.objects.filter(
+        id=order_driver_id,
+        status=OrderDriver.DriverRequestStatus.REQUESTED,
+        requested_at=requested_at,
+        order__status=Order.OrderStatus.PENDING,
+    ).update(status=OrderDriver.DriverRequestStatus.TIMEOUT)
+    if not expired:
+        return None
+
+    logger.info(f"Order {order_id} timeout detected for driver {driver_id}.")
+
+    try:
+        from apps.order.services.driver_orders_websocket import send_order_timeout_to_driver
+        send_order_timeout_to_driver(driver_id, order_id)
+    except Exception as e:
+        logger.warning(f"Failed to send WebSocket order_timeout to driver {driver_id}: {e}")
+
+    try:
+        order = Order.objects.get(id=order_id)
+        next_order_driver = DriverAssignmentService.assign_to_next_driver(order)
+        if next_order_driver:
+            logger.info(
+                f"Order {order_id} reassigned to driver {next_order_driver.driver.id}"
+            )
+            return True
+        logger.warning(
+            f"Order {order_id} could not be reassigned - no more drivers available"
+        )
+    except Exception as e:
+        logger.error(
+            f"Failed to reassign order {order_id} after timeout: {e}",
+            exc_info=True
+        )
+    return False
+
+
+@shared_task(name='apps.order.tasks.expire_order_driver_request')
+def expire_order_driver_request(order_driver_id, requested_at):
+    """
+    Fires TIMEOUT_SECONDS after a driver was sent the order (scheduled by
+    ``DriverAssignmentService.assign_order_to_driver``).
+    """
+    row = OrderDriver.objects.filter(id=order_driver_id).values(
+        'order_id', 'driver_id'
+    ).first()
+    if row is None:
+        return None
+    reassigned = _expire_order_driver(
+        order_driver_id, row['order_id'], row['driver_id'],
+        datetime.fromisoformat(requested_at),
+    )
+    return {'timed_out': reassigned is not None, 'reassigned': bool(reassigned)}
+
+
 @shared_task(name='apps.order.tasks.check_order_timeouts')
 def check_order_timeouts():
+    """
+    Safety net for requests whose ``expire_order_driver_request`` task was
+    lost (broker restart, worker crash): expire anything past the deadline.
+    """
     logger.info("Starting check_order_timeouts task...")
-    
-    requested_order_drivers = OrderDriver.objects.filter(
-        status=OrderDriver.DriverRequestStatus.REQUESTED
-    ).select_related('order', 'driver')
-    total_requested = requested_order_drivers.count()
-    
+
+    cutoff = timezone.now() - timedelta(seconds=DriverAssignmentService.TIMEOUT_SECONDS)
+    overdue = OrderDriver.objects.filter(
+        status=OrderDriver.DriverRequestStatus.REQUESTED,
+        order__status=Order.OrderStatus.PENDING,
+        requested_at__lte=cutoff,
+    ).values_list('id', 'order_id', 'driver_id', 'requested_at')
+
     timeout_count = 0
     reassigned_count = 0
-    
-    for order_driver in requested_order_drivers:
-        if order_driver.order.status != Order.OrderStatus.PENDING:
+
+    for order_driver_id, order_id, driver_id, requested_at in overdue:
+        reassigned = _expire_order_driver(order_driver_id, order_id, driver_id, requested_at)
+        if reassigned is None:
             continue
-        
-        if order_driver.requested_at:
-            time_elapsed = timezone.now() - order_driver.requested_at
-            elapsed_seconds = time_elapsed.total_seconds()
-            
-            if elapsed_seconds >= DriverAssignmentService.TIMEOUT_SECONDS:
-                logger.info(
-                    f"Order {order_driver.order.id} timeout detected for driver {order_driver.driver.id}. "
-                    f"Elapsed: {elapsed_seconds:.2f} seconds"
-                )
-                
-                timed_out_driver_id = order_driver.driver.id
-                order_driver.status = OrderDriver.DriverRequestStatus.TIMEOUT
-                order_driver.save()
-                timeout_count += 1
-
-                try:
-                    from apps.order.services.driver_orders_websocket import send_order_timeout_to_driver
-                    send_order_timeout_to_driver(timed_out_driver_id, order_driver.order.id)
-                except Exception as e:
-                    logger.warning(f"Failed to send WebSocket order_timeout to driver {timed_out_driver_id}: {e}")
-
-                try:
-                    next_order_driver = DriverAssignmentService.assign_to_next_driver(order_driver.order)
-                    if next_order_driver:
-                        reassigned_count += 1
-                        logger.info(
-                            f"Order {order_driver.order.id} reassigned to driver {next_order_driver.driver.id}"
-                        )
-                    else:
-                        logger.warning(
-                            f"Order {order_driver.order.id} could not be reassigned - no more drivers available"
-                        )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to reassign order {order_driver.order.id} after timeout: {e}",
-                        exc_info=True
-                    )
-    
+        timeout_count += 1
+        if reassigned:
+            reassigned_count += 1
+
     logger.info(
         f"check_order_timeouts task completed. "
         f"Timeouts: {timeout_count}, Reassigned: {reassigned_count}"
     )
-    
+
     return {
         'timeouts': timeout_count,
         'reassigned': reassigned_count,
     }
 
 
+@shared_task(name='apps.order.tasks.flush_driver_locations')
+def flush_driver_locations():
+    from apps.order.services.driver_location_cache import flush_driver_locations as _flush
+
+    flushed = _flush()
+    if flushed:
+        logger.info(f"flush_driver_locations: wrote {flushed} driver locations")
+    return {'flushed': flushed}
+
+
 @shared_task(name='apps.order.tasks.assign_order_with_radius_delayed')
 def assign_order_with_radius_delayed(order_id, last_radius_km):
     logger.info(
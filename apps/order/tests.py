@@ -1,3 +1,505 @@
-from django.test import TestCase
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+import redis
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.accounts.models import CustomUser
+from apps.order.models import Order, OrderDriver, OrderItem, RatingFeedbackTag, RideType, TripRating
+from apps.order.services import driver_dashboard, driver_location_cache
+from apps.order.services.feedback_tags import get_feedback_tags
+from apps.order.services.ride_types import get_active_ride_types
+from apps.order.services.driver_assignment_service import DriverAssignmentService
+from apps.order.tasks import check_order_timeouts, expire_order_driver_request
+from apps.order.views import OrderPageNumberPagination
+
+TEST_REDIS_URL = os.getenv('TEST_DRIVER_LOCATION_REDIS_URL', 'redis://localhost:6379/15')
+
+
+def _redis_available():
+    try:
+        return redis.Redis.from_url(TEST_REDIS_URL, socket_connect_timeout=0.5).ping()
+    except redis.RedisError:
+        return False
+
+
+def _reset_location_clients():
+    driver_location_cache._sync_client = None
+    driver_location_cache._async_client = None
+
+
+@override_settings(DRIVER_LOCATION_REDIS_URL=TEST_REDIS_URL)
+class DriverLocationCacheFlushTests(TestCase):
+    """Write-through to Redis and the batched flush back to ``CustomUser``."""
+
+    def setUp(self):
+        if not _redis_available():
+            self.skipTest(f'Redis not reachable at {TEST_REDIS_URL}')
+        _reset_location_clients()
+        self.addCleanup(_reset_location_clients)
+        self.redis = redis.Redis.from_url(TEST_REDIS_URL, decode_responses=True)
+        self.redis.flushdb()
+        self.addCleanup(self.redis.flushdb)
+        self.driver = CustomUser.objects.create(
+            email='driver@example.com', username='driver', latitude=Decimal('41.000000'),
+            longitude=Decimal('69.000000'),
+        )
+        self.pinged_at = timezone.now().replace(microsecond=0) + timedelta(seconds=5)
+
+    def _store(self, latitude, longitude):
+        async_to_sync(driver_location_cache.store_driver_location)(
+            self.driver.id, latitude, longitude, self.pinged_at
+        )
+
+    def test_store_get_flush_writes_position(self):
+        self._store(Decimal('41.311081'), Decimal('69.240562'))
+
+        location = driver_location_cache.get_driver_location_sync(self.driver.id)
+        self.assertEqual(location['latitude'], '41.311081')
+        self.assertEqual(location['longitude'], '69.240562')
+        self.assertEqual(location['updated_at'], self.pinged_at)
+
+        self.assertEqual(driver_location_cache.flush_driver_locations(), 1)
+
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.latitude, Decimal('41.311081'))
+        self.assertEqual(self.driver.longitude, Decimal('69.240562'))
+        self.assertEqual(self.driver.updated_at, self.pinged_at)
+        self.assertFalse(self.redis.exists(driver_location_cache.DIRTY_DRIVERS_KEY))
+        self.assertFalse(self.redis.exists(driver_location_cache.FLUSHING_DRIVERS_KEY))
+        # Nothing pinged since: the next run is a no-op.
+        self.assertEqual(driver_location_cache.flush_driver_locations(), 0)
+
+    def test_failed_flush_is_retried_on_next_run(self):
+        self._store(Decimal('41.311081'), Decimal('69.240562'))
+
+        with mock.patch.object(
+            type(CustomUser.objects), 'bulk_update', side_effect=DatabaseError('boom')
+        ):
+            with self.assertRaises(DatabaseError):
+                driver_location_cache.flush_driver_locations()
+
+        self.assertEqual(
+            self.redis.smembers(driver_location_cache.FLUSHING_DRIVERS_KEY), {str(self.driver.id)}
+        )
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.latitude, Decimal('41.000000'))
+
+        self.assertEqual(driver_location_cache.flush_driver_locations(), 1)
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.latitude, Decimal('41.311081'))
+        self.assertFalse(self.redis.exists(driver_location_cache.FLUSHING_DRIVERS_KEY))
+
+
+class ResolveDriverLocationTests(SimpleTestCase):
+    """``resolve_driver_location`` prefers the cached ping and falls back to the DB columns."""
+
+    def setUp(self):
+        self.updated_at = timezone.now()
+        self.driver = CustomUser(
+            id=7, latitude=Decimal('41.000000'), longitude=Decimal('69.000000'),
+            updated_at=self.updated_at,
+        )
+
+    def _resolve_with(self, client):
+        with mock.patch.object(driver_location_cache, '_get_sync_client', return_value=client):
+            return driver_location_cache.resolve_driver_location(self.driver)
+
+    def test_cache_hit_wins(self):
+        client = mock.Mock()
+        client.hgetall.return_value = {
+            'lat': '41.5', 'lon': '69.5', 'ts': '2026-01-01T10:00:00+00:00',
+        }
+        location = self._resolve_with(client)
+        self.assertEqual(location['latitude'], '41.5')
+        self.assertEqual(location['longitude'], '69.5')
+        client.hgetall.assert_called_once_with('driver:loc:7')
+
+    def test_cache_miss_falls_back_to_db_columns(self):
+        client = mock.Mock()
+        client.hgetall.return_value = {}
+        self.assertEqual(self._resolve_with(client), {
+            'latitude': Decimal('41.000000'),
+            'longitude': Decimal('69.000000'),
+            'updated_at': self.updated_at,
+        })
+
+    def test_cache_error_falls_back_to_db_columns(self):
+        client = mock.Mock()
+        client.hgetall.side_effect = redis.ConnectionError('down')
+        with self.assertLogs(driver_location_cache.logger, 'WARNING'):
+            location = self._resolve_with(client)
+        self.assertEqual(location['latitude'], Decimal('41.000000'))
+        self.assertEqual(location['updated_at'], self.updated_at)
+
+
+class DriverCandidateBoundingBoxTests(TestCase):
+    """``_candidate_drivers`` keeps drivers inside the pickup box and drivers on an active trip."""
+
+    PICKUP = (41.311081, 69.240562)
+
+    def setUp(self):
+        self.driver_group, _ = Group.objects.get_or_create(name='Driver')
+        self.rider = CustomUser.objects.create(email='rider@example.com', username='rider')
+
+    def _driver(self, name, latitude, longitude):
+        driver = CustomUser.objects.create(
+            email=f'{name}@example.com', username=name, is_online=True,
+            latitude=Decimal(latitude), longitude=Decimal(longitude),
+        )
+        driver.groups.add(self.driver_group)
+        return driver
+
+    def _accepted_trip(self, driver, order_status):
+        order = Order.objects.create(user=self.rider, status=order_status)
+        OrderDriver.objects.create(
+            order=order, driver=driver, status=OrderDriver.DriverRequestStatus.ACCEPTED
+        )
+
+    def _candidate_ids(self, max_radius_km):
+        return set(DriverAssignmentService._candidate_drivers(
+            self.driver_group, *self.PICKUP, exclude_driver_ids=[], max_radius_km=max_radius_km
+        ).values_list('id', flat=True))
+
+    def test_box_excludes_far_drivers_but_keeps_active_trips(self):
+        near = self._driver('near', '41.320000', '69.250000')
+        far = self._driver('far', '40.500000', '68.500000')
+        far_on_trip = self._driver('far_on_trip', '40.500000', '68.500000')
+        self._accepted_trip(far_on_trip, Order.OrderStatus.IN_PROGRESS)
+        # Two past trips: completed ones don't count, and must not duplicate rows.
+        far_done = self._driver('far_done', '40.500000', '68.500000')
+        self._accepted_trip(far_done, Order.OrderStatus.COMPLETED)
+        self._accepted_trip(far_done, Order.OrderStatus.COMPLETED)
+
+        self.assertEqual(self._candidate_ids(5.0), {near.id, far_on_trip.id})
+        self.assertEqual(self._candidate_ids(None), {near.id, far.id, far_on_trip.id, far_done.id})
+
+    def test_active_trip_driver_listed_once(self):
+        driver = self._driver('busy', '40.500000', '68.500000')
+        self._accepted_trip(driver, Order.OrderStatus.ACCEPTED)
+        self._accepted_trip(driver, Order.OrderStatus.ON_THE_WAY)
+
+        ids = list(DriverAssignmentService._candidate_drivers(
+            self.driver_group, *self.PICKUP, exclude_driver_ids=[], max_radius_km=5.0
+        ).values_list('id', flat=True))
+        self.assertEqual(ids, [driver.id])
+
+
+@mock.patch('apps.notification.services.enqueue_push_to_user_id')
+class TripRatingCreateViewTests(TestCase):
+    """Rider rates a completed trip."""
+
+    def setUp(self):
+        self.rider = CustomUser.objects.create(email='rider@example.com', username='rider')
+        self.driver = CustomUser.objects.create(
+            email='driver@example.com', username='driver', first_name='Ali', last_name='Valiyev',
+        )
+        self.order = Order.objects.create(user=self.rider, status=Order.OrderStatus.COMPLETED)
+        OrderDriver.objects.create(
+            order=self.order, driver=self.driver, status=OrderDriver.DriverRequestStatus.ACCEPTED
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.rider)
+        self.url = reverse('trip-rating-create')
+
+    def test_order_and_driver_loaded_in_one_query(self, enqueue_push):
+        # order + accepted driver, TripRating insert, feedback_tags read-back.
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                self.url, {'order_id': self.order.id, 'rating': 5}, format='json'
+            )
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['data']['driver'], self.driver.id)
+        self.assertEqual(response.data['data']['driver_name'], 'Ali Valiyev')
+        enqueue_push.assert_called_once()
+
+    def test_order_without_accepted_driver(self, enqueue_push):
+        OrderDriver.objects.filter(order=self.order).update(
+            status=OrderDriver.DriverRequestStatus.REJECTED
+        )
+        response = self.client.post(self.url, {'order_id': self.order.id, 'rating': 5}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['message'], 'No driver found for this order')
+        self.assertFalse(TripRating.objects.exists())
+
+    def test_non_owner_is_rejected_before_order_state(self, enqueue_push):
+        Order.objects.filter(pk=self.order.pk).update(status=Order.OrderStatus.IN_PROGRESS)
+        other = CustomUser.objects.create(email='other@example.com', username='other')
+        self.client.force_authenticate(user=other)
+
+        response = self.client.post(self.url, {'order_id': self.order.id, 'rating': 5}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+
+class DriverEarningsCacheTests(TestCase):
+    """Per-minute cached earnings agree with a direct aggregate, also across midnight."""
+
+    def setUp(self):
+        cache.clear()
+        driver_dashboard._earnings_cutoffs.cache_clear()
+        self.addCleanup(cache.clear)
+        rider = CustomUser.objects.create(email='rider@example.com', username='rider')
+        self.driver = CustomUser.objects.create(email='driver@example.com', username='driver')
+        self.midnight = datetime(2026, 3, 2, tzinfo=dt_timezone.utc)
+        self.order_times = {
+            Decimal('12.00'): self.midnight - timedelta(minutes=30),
+            Decimal('7.50'): self.midnight + timedelta(seconds=20),
+            Decimal('20.00'): self.midnight - timedelta(days=3),
+        }
+        for price, completed_at in self.order_times.items():
+            order = Order.objects.create(user=rider, status=Order.OrderStatus.COMPLETED)
+            OrderDriver.objects.create(
+                order=order, driver=self.driver, status=OrderDriver.DriverRequestStatus.ACCEPTED
+            )
+            OrderItem.objects.bulk_create([
+                OrderItem(order=order, calculated_price=price, distance_km=Decimal('3.00'))
+            ])
+            Order.objects.filter(pk=order.pk).update(updated_at=completed_at)
+
+    def _earnings_at(self, now):
+        with mock.patch.object(driver_dashboard.timezone, 'now', return_value=now):
+            return driver_dashboard.get_driver_earnings(self.driver.id)
+
+    def _uncached_today(self, now):
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return Order.objects.filter(
+            order_drivers__driver=self.driver, status=Order.OrderStatus.COMPLETED,
+            updated_at__gte=today_start, updated_at__lte=now,
+        ).aggregate(total=Sum('order_items__calculated_price'))['total'] or Decimal('0')
+
+    def test_cached_today_matches_aggregate_on_both_sides_of_midnight(self):
+        # Orders that only exist "in the future" of the first read stay out of it.
+        before = self.midnight - timedelta(seconds=30)
+        Order.objects.filter(updated_at__gt=before).update(status=Order.OrderStatus.IN_PROGRESS)
+        stats = self._earnings_at(before)
+        self.assertEqual(stats['today_earnings'], self._uncached_today(before))
+        self.assertEqual(stats['today_earnings'], Decimal('12.00'))
+        self.assertEqual(stats['weekly_rides_count'], 2)
+
+        # A new minute on the next day: the cached pre-midnight totals are not reused.
+        Order.objects.filter(status=Order.OrderStatus.IN_PROGRESS).update(
+            status=Order.OrderStatus.COMPLETED
+        )
+        after = self.midnight + timedelta(seconds=30)
+        stats = self._earnings_at(after)
+        self.assertEqual(stats['today_earnings'], self._uncached_today(after))
+        self.assertEqual(stats['today_earnings'], Decimal('7.50'))
+        self.assertEqual(stats['total_rides_count'], 3)
+        self.assertEqual(stats['today_target'], 10)
+
+    def test_same_minute_is_served_from_cache(self):
+        now = self.midnight + timedelta(minutes=5, seconds=10)
+        first = self._earnings_at(now)
+        with self.assertNumQueries(0):
+            second = self._earnings_at(now + timedelta(seconds=40))
+        self.assertEqual(first, second)
+
+
+@mock.patch('apps.order.services.driver_orders_websocket.send_order_timeout_to_driver')
+@mock.patch.object(DriverAssignmentService, 'assign_to_next_driver', return_value=None)
+class OrderDriverExpiryTests(TestCase):
+    """Per-request expiry task and the ``check_order_timeouts`` safety net."""
+
+    def setUp(self):
+        rider = CustomUser.objects.create(email='rider@example.com', username='rider')
+        self.driver = CustomUser.objects.create(email='driver@example.com', username='driver')
+        self.order = Order.objects.create(user=rider, status=Order.OrderStatus.PENDING)
+        self.requested_at = timezone.now() - timedelta(seconds=DriverAssignmentService.TIMEOUT_SECONDS)
+        self.order_driver = OrderDriver.objects.create(
+            order=self.order, driver=self.driver,
+            status=OrderDriver.DriverRequestStatus.REQUESTED, requested_at=self.requested_at,
+        )
+
+    def _expire(self):
+        return expire_order_driver_request(self.order_driver.id, self.requested_at.isoformat())
+
+    def _status(self):
+        self.order_driver.refresh_from_db()
+        return self.order_driver.status
+
+    def test_expires_still_requested_row(self, assign_to_next_driver, send_timeout):
+        self.assertEqual(self._expire(), {'timed_out': True, 'reassigned': False})
+
+        self.assertEqual(self._status(), OrderDriver.DriverRequestStatus.TIMEOUT)
+        send_timeout.assert_called_once_with(self.driver.id, self.order.id)
+        assign_to_next_driver.assert_called_once_with(self.order)
+
+    def test_noop_when_driver_already_accepted(self, assign_to_next_driver, send_timeout):
+        OrderDriver.objects.filter(pk=self.order_driver.pk).update(
+            status=OrderDriver.DriverRequestStatus.ACCEPTED
+        )
+
+        self.assertEqual(self._expire(), {'timed_out': False, 'reassigned': False})
+        self.assertEqual(self._status(), OrderDriver.DriverRequestStatus.ACCEPTED)
+        send_timeout.assert_not_called()
+        assign_to_next_driver.assert_not_called()
+
+    def test_noop_when_request_was_resent(self, assign_to_next_driver, send_timeout):
+        # The driver was asked again; the first countdown must not expire the new request.
+        OrderDriver.objects.filter(pk=self.order_driver.pk).update(requested_at=timezone.now())
+
+        self.assertEqual(self._expire(), {'timed_out': False, 'reassigned': False})
+        self.assertEqual(self._status(), OrderDriver.DriverRequestStatus.REQUESTED)
+        assign_to_next_driver.assert_not_called()
+
+    def test_safety_net_expires_rows_whose_countdown_was_lost(self, assign_to_next_driver, send_timeout):
+        fresh_driver = CustomUser.objects.create(email='fresh@example.com', username='fresh')
+        fresh = OrderDriver.objects.create(
+            order=self.order, driver=fresh_driver,
+            status=OrderDriver.DriverRequestStatus.REQUESTED, requested_at=timezone.now(),
+        )
+
+        self.assertEqual(check_order_timeouts(), {'timeouts': 1, 'reassigned': 0})
+
+        self.assertEqual(self._status(), OrderDriver.DriverRequestStatus.TIMEOUT)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, OrderDriver.DriverRequestStatus.REQUESTED)
+        # The countdown arriving late finds nothing left to do.
+        self.assertEqual(self._expire(), {'timed_out': False, 'reassigned': False})
+        assign_to_next_driver.assert_called_once_with(self.order)
+
+
+class OrderPageNumberPaginationTests(TestCase):
+    """``FirstPageCountPaginator`` skips COUNT(*) when the first page is short."""
+
+    def setUp(self):
+        self.rider = CustomUser.objects.create(email='rider@example.com', username='rider')
+
+    def _create_orders(self, count):
+        for _ in range(count):
+            Order.objects.create(user=self.rider)
+
+    def _paginate(self, query_string=''):
+        request = Request(APIRequestFactory().get(f'/api/v1/order/my-orders/{query_string}'))
+        paginator = OrderPageNumberPagination()
+        rows = paginator.paginate_queryset(Order.objects.order_by('id'), request)
+        return rows, paginator.get_paginated_response([order.id for order in rows]).data
+
+    def test_short_first_page_skips_count(self):
+        self._create_orders(3)
+        with self.assertNumQueries(1):
+            rows, data = self._paginate()
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(data['count'], 3)
+        self.assertIsNone(data['next'])
+
+    def test_full_first_page_counts(self):
+        self._create_orders(12)
+        with self.assertNumQueries(2):
+            rows, data = self._paginate()
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(data['count'], 12)
+        self.assertEqual(data['next'], 'http://testserver/api/v1/order/my-orders/?page=2')
+
+    def test_exactly_one_full_page(self):
+        self._create_orders(10)
+        rows, data = self._paginate()
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(data['count'], 10)
+        self.assertIsNone(data['next'])
+
+    def test_later_pages_use_default_paginator(self):
+        self._create_orders(12)
+        rows, data = self._paginate('?page=2')
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(data['count'], 12)
+        self.assertIsNone(data['next'])
+
+
+class MyOrderListViewTests(TestCase):
+    """The rider's order list costs the same number of queries however many orders it shows."""
+
+    def setUp(self):
+        self.rider = CustomUser.objects.create(email='rider@example.com', username='rider')
+        self.client = APIClient()
+        self.url = reverse('my-orders')
+
+    def _add_orders(self, count):
+        for _ in range(count):
+            order = Order.objects.create(user=self.rider, status=Order.OrderStatus.COMPLETED)
+            OrderItem.objects.bulk_create([
+                OrderItem(order=order, calculated_price=Decimal('10.00'), distance_km=Decimal('2.00'))
+            ])
+
+    def _get_orders(self):
+        # A fresh user instance per request, as authentication would load it.
+        self.client.force_authenticate(user=CustomUser.objects.get(pk=self.rider.pk))
+        # orders, order items, the user's groups, the rider rating stats.
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def test_query_count_does_not_grow_with_orders(self):
+        self._add_orders(2)
+        self.assertEqual(len(self._get_orders()), 2)
+
+        self._add_orders(6)
+        self.assertEqual(len(self._get_orders()), 8)
+
+
+class AdminCachedListsInvalidationTests(TestCase):
+    """Saving or deleting a feedback tag / ride type drops the cached lists."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _tag_names(self, tag_type='positive'):
+        return [tag['name'] for tag in get_feedback_tags(tag_type, 'rider_to_driver')]
+
+    def _ride_type_names(self):
+        return [row['name'] for row in async_to_sync(get_active_ride_types)()]
+
+    def test_feedback_tag_save_and_delete_clear_cache(self):
+        RatingFeedbackTag.objects.create(name='Calm', tag_type='positive', rating_target='rider_to_driver')
+        self.assertEqual(self._tag_names(), ['Calm'])
+
+        kind = RatingFeedbackTag.objects.create(
+            name='Kind', tag_type='positive', rating_target='rider_to_driver'
+        )
+        self.assertEqual(self._tag_names(), ['Calm', 'Kind'])
+
+        # Moving a tag to the other list refreshes both.
+        self.assertEqual(self._tag_names('negative'), [])
+        kind.tag_type = 'negative'
+        kind.save()
+        self.assertEqual(self._tag_names(), ['Calm'])
+        self.assertEqual(self._tag_names('negative'), ['Kind'])
+
+        kind.delete()
+        self.assertEqual(self._tag_names('negative'), [])
+
+    def test_cached_feedback_tags_are_copies(self):
+        RatingFeedbackTag.objects.create(name='Calm', tag_type='positive', rating_target='rider_to_driver')
+        get_feedback_tags('positive', 'rider_to_driver')[0]['name'] = 'changed'
+        self.assertEqual(self._tag_names(), ['Calm'])
+
+    def test_ride_type_save_and_delete_clear_cache(self):
+        economy = RideType.objects.create(name='Economy', base_price=Decimal('5.00'))
+        self.assertEqual(self._ride_type_names(), ['Economy'])
+
+        economy.base_price = Decimal('6.00')
+        economy.save()
+        rows = async_to_sync(get_active_ride_types)()
+        self.assertEqual(rows[0]['base_price'], Decimal('6.00'))
+
+        RideType.objects.create(name='Comfort', base_price=Decimal('8.00'))
+        self.assertEqual(sorted(self._ride_type_names()), ['Comfort', 'Economy'])
+
+        economy.delete()
+        self.assertEqual(self._ride_type_names(), ['Comfort'])
@@ -1,11 +1,16 @@
+import asyncio
 from types import SimpleNamespace
 
 from rest_framework import status
+from django.core.paginator import Page as DjangoPage, Paginator as DjangoPaginator
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 from apps.common.views import AsyncAPIView
 from apps.common.throttles import OrderCreateThrottle
 from rest_framework.permissions import IsAuthenticated
 from asgiref.sync import sync_to_async
+from django.db.models import Exists, FilteredRelation, OuterRef, Prefetch, Q, Value, prefetch_related_objects
+from django.db.models.functions import Concat
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes, OpenApiExample
 
 from .serializers import (
@@ -35,7 +40,6 @@ from .serializers import (
     TripRatingSerializer,
     DriverRiderRatingCreateSerializer,
     DriverRiderRatingSerializer,
-    RatingFeedbackTagSerializer,
 )
 from .serializers.driver import DriverCashoutSerializer, DriverCashoutCreateRequestSerializer
 from .serializers.cancel_order import OrderCancelSerializer, DriverCancelSerializer
@@ -56,6 +60,112 @@ from apps.payment.models import SavedCard
 from .services.surge_pricing_service import calculate_distance
 from .services.driver_assignment_service import DriverAssignmentService
 from .services.driver_dashboard import get_driver_dashboard, get_ride_history, get_driver_earnings
+from .services.feedback_tags import get_feedback_tags
+from .services.ride_types import get_active_ride_types
+
+ORDER_STATUS_CHOICES = frozenset(Order.OrderStatus.values)
+ORDER_TYPE_CHOICES = frozenset(Order.OrderType.values)
+ORDER_STATUS_CHOICES_HINT = f'Must be one of: {", ".join(Order.OrderStatus.values)}'
+ORDER_TYPE_CHOICES_HINT = f'Must be one of: {", ".join(Order.OrderType.values)}'
+RIDE_HISTORY_STATUSES = frozenset({
+    Order.OrderStatus.COMPLETED,
+    Order.OrderStatus.CANCELLED,
+    Order.OrderStatus.REJECTED,
+})
+DRIVER_CANCELLABLE_STATUSES = (
+    Order.OrderStatus.ACCEPTED,
+    Order.OrderStatus.ON_THE_WAY,
+    Order.OrderStatus.ARRIVED,
+    Order.OrderStatus.IN_PROGRESS,
+)
+
+
+# Page/page_size query parameters shared by the paginated list endpoints.
+PAGINATION_PARAMETERS = (
+    OpenApiParameter('page', OpenApiTypes.INT, OpenApiParameter.QUERY, required=False, description='Page number'),
+    OpenApiParameter('page_size', OpenApiTypes.INT, OpenApiParameter.QUERY, required=False, description='Page size'),
+)
+MY_ORDER_LIST_PARAMETERS = [
+    OpenApiParameter('status', OpenApiTypes.STR, OpenApiParameter.QUERY, required=False, description='Filter by order status'),
+    OpenApiParameter('order_type', OpenApiTypes.STR, OpenApiParameter.QUERY, required=False, description='Filter by order type'),
+    *PAGINATION_PARAMETERS,
+    OpenApiParameter('cursor', OpenApiTypes.STR, OpenApiParameter.QUERY, required=False, description='Keyset pagination cursor (from next/previous)'),
+]
+
+
+def _error_response(message, *, errors=None, http_status=status.HTTP_400_BAD_REQUEST):
+    """The ``{'message', 'status': 'error'[, 'errors']}`` envelope used by the views."""
+    data = {'message': message, 'status': 'error'}
+    if errors is not None:
+        data['errors'] = errors
+    return Response(data, status=http_status)
+
+
+class FirstPageCountPaginator(DjangoPaginator):
+    """
+    Django Paginator that skips ``COUNT(*)`` when the first page is short:
+    if page 1 returns fewer than ``per_page`` rows, that length is the count.
+    Otherwise the rows already fetched are reused and only the COUNT runs.
+    """
+
+    def page(self, number):
+        if str(number) != '1' or self.orphans:
+            return super().page(number)
+        rows = list(self.object_list[:self.per_page])
+        if not rows and not self.allow_empty_first_page:
+            return super().page(number)
+        if len(rows) < self.per_page:
+            # Assigning shadows the ``count`` cached_property on this instance.
+            self.count = len(rows)
+        return DjangoPage(rows, 1, self)
+
+
+class OrderPageNumberPagination(PageNumberPagination):
+    django_paginator_class = FirstPageCountPaginator
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_paginated_response(self, data, message='Orders retrieved successfully'):
+        # Project envelope built in one go; rows go under ``data``, not ``results``.
+        # count/links were resolved by paginate_queryset, so this does no query.
+        return Response({
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'message': message,
+            'status': 'success',
+            'data': data,
+        })
+
+
+class OrderCursorPagination(CursorPagination):
+    ordering = ('-created_at', '-id')
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+async def _run_sync(fn):
+    """Run ``fn`` (ORM access + serialization) in one thread-pool hop."""
+    return await sync_to_async(fn, thread_sensitive=True)()
+
+
+async def _is_driver(user):
+    """
+    Whether ``user`` is in the Driver group. RoleAwareJWTAuthentication
+    loads this with the user row (``in_driver_group``); otherwise one
+    ``SELECT 1 ... LIMIT 1``, memoized on the (per-request) user instance.
+    """
+    cached = getattr(user, 'in_driver_group', None)
+    if cached is not None:
+        return cached
+    cached = getattr(user, '_is_driver', None)
+    if cached is None:
+        cached = await user.groups.filter(name='Driver').aexists()
+        user._is_driver = cached
+    return cached
+
 
 class OrderCreateView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
@@ -317,16 +427,11 @@ class OrderScheduleCreateView(AsyncAPIView):
 class DriverNearbyOrdersView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(tags=['Driver: Orders & trips'], summary='Nearby orders', description='List pending ride requests near the current driver with distance and order brief payload. Driver role required.')
     async def get(self, request):
         user = request.user
 
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response(
                 {
@@ -347,6 +452,11 @@ class DriverNearbyOrdersView(AsyncAPIView):
         )
         order_drivers = await sync_to_async(list)(order_drivers_qs)
 
+        from .services.driver_location_cache import aresolve_driver_location
+
+        location = await aresolve_driver_location(user)
+        driver_lat, driver_lon = location['latitude'], location['longitude']
+
         nearby_orders = []
         for order_driver in order_drivers:
             order = order_driver.order
@@ -384,10 +494,10 @@ class DriverNearbyOrdersView(AsyncAPIView):
             if not first_item or not first_item.latitude_from or not first_item.longitude_from:
                 continue
 
-            if user.latitude and user.longitude:
+            if driver_lat and driver_lon:
                 distance = calculate_distance(
-                    user.latitude,
-                    user.longitude,
+                    driver_lat,
+                    driver_lon,
                     first_item.latitude_from,
                     first_item.longitude_from,
                 )
@@ -411,16 +521,11 @@ class DriverNearbyOrdersView(AsyncAPIView):
 class DriverOrderActionView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(tags=['Driver: Orders & trips'], summary='Accept/Reject order', description='Driver decision endpoint for a pending request. Body: order_id and action=accept|reject. Updates assignment and notifies rider in real time.', request=DriverOrderActionSerializer)
     async def post(self, request):
         user = request.user
 
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response(
                 {
@@ -638,11 +743,6 @@ class DriverOnTheWayView(AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(
         tags=['Driver: Orders & trips'],
         summary='Driver: on the way to pickup',
@@ -654,7 +754,7 @@ class DriverOnTheWayView(AsyncAPIView):
     )
     async def post(self, request):
         user = request.user
-        if not await self._check_driver_role(user):
+        if not await _is_driver(user):
             return Response(
                 {'message': 'Only drivers can access this endpoint', 'status': 'error'},
                 status=status.HTTP_403_FORBIDDEN,
@@ -751,11 +851,6 @@ class DriverArrivedView(AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(
         tags=['Driver: Orders & trips'],
         summary='Driver: arrived at pickup',
@@ -764,7 +859,7 @@ class DriverArrivedView(AsyncAPIView):
     )
     async def post(self, request):
         user = request.user
-        if not await self._check_driver_role(user):
+        if not await _is_driver(user):
             return Response(
                 {'message': 'Only drivers can access this endpoint', 'status': 'error'},
                 status=status.HTTP_403_FORBIDDEN,
@@ -859,11 +954,6 @@ class DriverArrivedView(AsyncAPIView):
 class DriverPickupView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(
         tags=['Driver: Orders & trips'],
         summary='Confirm pickup',
@@ -875,7 +965,7 @@ class DriverPickupView(AsyncAPIView):
     )
     async def post(self, request):
         user = request.user
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response({'message': 'Only drivers can access this endpoint', 'status': 'error'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -958,11 +1048,6 @@ class DriverPickupView(AsyncAPIView):
 class DriverCompleteView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(
         tags=['Driver: Orders & trips'],
         summary='Confirm complete/dropoff',
@@ -979,7 +1064,7 @@ class DriverCompleteView(AsyncAPIView):
         import stripe
 
         user = request.user
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response({'message': 'Only drivers can access this endpoint', 'status': 'error'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -1228,15 +1313,10 @@ class DriverCompleteView(AsyncAPIView):
 class DriverCancelOrderView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(tags=['Driver: Orders & trips'], summary='Cancel order (driver)', description='Driver-initiated cancellation. Body: order_id, reason, optional other_reason. Persists CancelOrder and notifies rider channels.', request=DriverCancelSerializer)
     async def post(self, request):
         user = request.user
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response({'message': 'Only drivers can access this endpoint', 'status': 'error'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -1274,32 +1354,49 @@ class DriverCancelOrderView(AsyncAPIView):
         if order.status == Order.OrderStatus.COMPLETED:
             return Response({'message': 'Cannot cancel a completed order', 'status': 'error'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if order.status not in [
-            Order.OrderStatus.ACCEPTED,
-            Order.OrderStatus.ON_THE_WAY,
-            Order.OrderStatus.ARRIVED,
-            Order.OrderStatus.IN_PROGRESS,
-        ]:
+        if order.status not in DRIVER_CANCELLABLE_STATUSES:
             return Response(
                 {'message': f'Cannot cancel order with status: {order.status}', 'status': 'error'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        def _cancel_order_and_record():
+            from django.db import transaction
+            from django.utils import timezone
+
+            # Status flip and CancelOrder row in one transaction and one thread
+            # hop; the conditional UPDATE lets a concurrent rider cancel or
+            # completion win instead of being overwritten.
+            with transaction.atomic():
+                updated = Order.objects.filter(
+                    pk=order.pk, status__in=DRIVER_CANCELLABLE_STATUSES,
+                ).update(
+                    status=Order.OrderStatus.CANCELLED,
+                    updated_at=timezone.now(),
+                )
+                if not updated:
+                    return False
+                CancelOrder.objects.create(
+                    order=order,
+                    driver=order_driver,
+                    cancelled_by=CancelOrder.CancelledBy.DRIVER,
+                    reason=reason,
+                    other_reason=other_reason if reason == 'other' else None
+                )
+            return True
+
+        if not await sync_to_async(_cancel_order_and_record)():
+            return Response(
+                {'message': 'Order is already cancelled or completed', 'status': 'error'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         order.status = Order.OrderStatus.CANCELLED
-        await sync_to_async(order.save)(update_fields=['status'])
         try:
             from apps.chat.models import ChatRoom
             await sync_to_async(lambda: ChatRoom.objects.filter(order=order).update(status=ChatRoom.RoomStatus.CANCEL))()
         except Exception as e:
             import logging
             logging.getLogger(__name__).error(f"Failed to update ChatRoom status for order {order.id}: {e}")
-        await sync_to_async(CancelOrder.objects.create)(
-            order=order,
-            driver=order_driver,
-            cancelled_by=CancelOrder.CancelledBy.DRIVER,
-            reason=reason,
-            other_reason=other_reason if reason == 'other' else None
-        )
 
         try:
             from apps.notification.services import enqueue_push_to_user_id
@@ -1340,16 +1437,11 @@ class DriverCancelOrderView(AsyncAPIView):
 class DriverLocationUpdateView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(tags=['Driver: Location'], summary='Update location', description="Update driver's GPS location. Body: latitude, longitude. Role: Driver.", request=DriverLocationUpdateSerializer)
     async def post(self, request):
         user = request.user
 
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response(
                 {
@@ -1362,7 +1454,7 @@ class DriverLocationUpdateView(AsyncAPIView):
         serializer = DriverLocationUpdateSerializer(data=request.data)
         is_valid = await sync_to_async(lambda: serializer.is_valid())()
         if not is_valid:
-            errors = await sync_to_async(lambda: serializer.errors)()
+            errors = serializer.errors
             return Response(
                 {
                     'message': 'Validation error',
@@ -1372,33 +1464,61 @@ class DriverLocationUpdateView(AsyncAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = await sync_to_async(lambda: serializer.validated_data)()
+        data = serializer.validated_data
+
+        from django.utils import timezone
+        from .services.driver_location_cache import discard_driver_location, store_driver_location
 
+        # Hot path (every few seconds per active driver): pings go to Redis and
+        # are flushed to the DB in batches by tasks.flush_driver_locations.
+        # If Redis is unavailable, fall back to a direct UPDATE.
+        now = timezone.now()
+        try:
+            await store_driver_location(user.id, data['latitude'], data['longitude'], now)
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(
+                'Driver location cache write failed for driver %s: %s', user.id, e
+            )
+            await CustomUser.objects.filter(pk=user.id).aupdate(
+                latitude=data['latitude'],
+                longitude=data['longitude'],
+                updated_at=now,
+            )
+            # An older cached ping would otherwise shadow this row for readers
+            # and overwrite it on the next flush.
+            try:
+                await discard_driver_location(user.id)
+            except Exception as e:
+                logging.getLogger(__name__).warning(
+                    'Driver location cache discard failed for driver %s: %s', user.id, e
+                )
         user.latitude = data['latitude']
         user.longitude = data['longitude']
-        await sync_to_async(user.save)(update_fields=['latitude', 'longitude'])
+        user.updated_at = now
 
-        try:
-            from .services.order_tracking_websocket import notify_driver_location_updated
+        def _notify_and_serialize():
+            try:
+                from .services.order_tracking_websocket import notify_driver_location_updated
 
-            await sync_to_async(notify_driver_location_updated)(
-                user.id,
-                user.latitude,
-                user.longitude,
-                user.updated_at,
-            )
-        except Exception:
-            # Location update API should still succeed even if websocket push fails.
-            pass
+                notify_driver_location_updated(
+                    user.id,
+                    user.latitude,
+                    user.longitude,
+                    user.updated_at,
+                )
+            except Exception:
+                # Location update API should still succeed even if websocket push fails.
+                pass
 
-        response_data = {
-            'driver_id': user.id,
-            'latitude': user.latitude,
-            'longitude': user.longitude,
-            'updated_at': user.updated_at,
-        }
-        out_serializer = DriverLocationSerializer(response_data)
-        serialized = await sync_to_async(lambda: out_serializer.data)()
+            return DriverLocationSerializer({
+                'driver_id': user.id,
+                'latitude': user.latitude,
+                'longitude': user.longitude,
+                'updated_at': user.updated_at,
+            }).data
+
+        serialized = await _run_sync(_notify_and_serialize)
 
         return Response(
             {
@@ -1417,7 +1537,7 @@ class DriverLocationForOrderView(AsyncAPIView):
         user = request.user
 
         try:
-            order = await Order.objects.select_related('user').aget(id=order_id)
+            order = await Order.objects.only('id', 'user_id').aget(id=order_id)
         except Order.DoesNotExist:
             return Response(
                 {
@@ -1427,7 +1547,7 @@ class DriverLocationForOrderView(AsyncAPIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        if order.user != user:
+        if order.user_id != user.id:
             return Response(
                 {
                     'message': 'You do not have permission to view this order',
@@ -1437,9 +1557,24 @@ class DriverLocationForOrderView(AsyncAPIView):
             )
 
         order_driver = await OrderDriver.objects.filter(
-            order=order,
+            order_id=order.id,
             status=OrderDriver.DriverRequestStatus.ACCEPTED,
-        ).select_related('driver').afirst()
+        ).select_related('driver').only(
+            'id',
+            'status',
+            'driver',
+            'driver__id',
+            'driver__email',
+            'driver__first_name',
+            'driver__last_name',
+            'driver__avatar',
+            'driver__latitude',
+            'driver__longitude',
+            'driver__created_at',
+            'driver__updated_at',
+        ).annotate(
+            driver_full_name=Concat('driver__first_name', Value(' '), 'driver__last_name'),
+        ).afirst()
 
         if not order_driver or not order_driver.driver:
             return Response(
@@ -1451,6 +1586,13 @@ class DriverLocationForOrderView(AsyncAPIView):
             )
 
         driver = order_driver.driver
+        from .services.driver_location_cache import aresolve_driver_location
+
+        location = await aresolve_driver_location(driver)
+        driver.latitude = location['latitude']
+        driver.longitude = location['longitude']
+        driver.updated_at = location['updated_at']
+
         if driver.latitude is None or driver.longitude is None:
             return Response(
                 {
@@ -1486,7 +1628,7 @@ class DriverLocationForOrderView(AsyncAPIView):
             avatar_url = request_obj.build_absolute_uri(driver.avatar.url) if hasattr(request_obj, 'build_absolute_uri') else driver.avatar.url
 
         driver_info_data = {
-            'name': driver.get_full_name(),
+            'name': (order_driver.driver_full_name or '').strip() or driver.email,
             'avatar': avatar_url,
             'rating': average_rating,
             'trips_count': completed_trips_count,
@@ -1501,8 +1643,7 @@ class DriverLocationForOrderView(AsyncAPIView):
             }
         }
 
-        serializer = DriverInfoSerializer(driver_info_data)
-        serialized = await sync_to_async(lambda: serializer.data)()
+        serialized = await _run_sync(lambda: DriverInfoSerializer(driver_info_data).data)
 
         return Response(
             {
@@ -1531,25 +1672,25 @@ class PriceEstimateView(AsyncAPIView):
     async def post(self, request):
         import logging
         import math
+        from decimal import Decimal
 
-        from apps.order.models import RideType
         from apps.order.services.surge_pricing_service import SurgePricingService, calculate_distance
 
         logger = logging.getLogger(__name__)
 
         serializer = PriceEstimateSerializer(data=request.data)
         
-        is_valid = await sync_to_async(lambda: serializer.is_valid())()
+        is_valid = serializer.is_valid()
         
         if is_valid:
-            validated_data = await sync_to_async(lambda: serializer.validated_data)()
+            validated_data = serializer.validated_data
             
-            lat_from = float(validated_data['latitude_from'])
-            lon_from = float(validated_data['longitude_from'])
-            lat_to = float(validated_data['latitude_to'])
-            lon_to = float(validated_data['longitude_to'])
+            lat_from = validated_data['latitude_from']
+            lon_from = validated_data['longitude_from']
+            lat_to = validated_data['latitude_to']
+            lon_to = validated_data['longitude_to']
             
-            distance_km = await sync_to_async(calculate_distance)(lat_from, lon_from, lat_to, lon_to)
+            distance_km = calculate_distance(lat_from, lon_from, lat_to, lon_to)
             if math.isnan(distance_km) or math.isinf(distance_km) or distance_km < 0:
                 return Response(
                     {
@@ -1568,52 +1709,55 @@ class PriceEstimateView(AsyncAPIView):
             except (TypeError, ValueError):
                 surge_multiplier = 1.0
             
-            ride_types = await sync_to_async(list)(
-                RideType.objects.filter(is_active=True).order_by('sort_order', 'id')
-            )
+            # Plain rows: only the columns the estimate uses, no model instances.
+            ride_types = await get_active_ride_types()
             
+            # Same Decimal formula as RideType.calculate_price, with the per-request
+            # operands converted once instead of per ride type (and no thread hop).
+            distance_dec = Decimal(str(distance_km))
+            surge_dec = Decimal(str(surge_multiplier))
+            distance_km_out = round(distance_km, 2)
+            distance_miles_out = round(distance_km * 0.621371, 2)
+            surge_out = float(surge_multiplier)
+
             estimates = []
             for ride_type in ride_types:
-                if not ride_type.base_price or not ride_type.price_per_km:
+                base_price = ride_type['base_price']
+                price_per_km = ride_type['price_per_km']
+                if not base_price or not price_per_km:
                     continue
                 try:
-                    price = await sync_to_async(ride_type.calculate_price)(distance_km, surge_multiplier)
-                    if not isinstance(price, (int, float)) or math.isnan(float(price)) or math.isinf(float(price)):
-                        logger.warning(
-                            'price-estimate: non-finite price for ride_type_id=%s', ride_type.id
-                        )
-                        continue
-                    price_f = round(float(price), 2)
-                    label = (ride_type.name_large or ride_type.name or '').strip()
+                    price_f = float(round((base_price + price_per_km * distance_dec) * surge_dec, 2))
+                    label = (ride_type['name_large'] or ride_type['name'] or '').strip()
                     if not label:
-                        label = f'Ride type {ride_type.id}'
+                        label = f"Ride type {ride_type['id']}"
                     estimates.append({
-                        'id': ride_type.id,
-                        'ride_type_id': ride_type.id,
-                        'sort_order': ride_type.sort_order,
+                        'id': ride_type['id'],
+                        'ride_type_id': ride_type['id'],
+                        'sort_order': ride_type['sort_order'],
                         'ride_type_name': label,
-                        'ride_type_name_large': ride_type.name_large or '',
-                        'ride_type_icon': ride_type.icon or '',
-                        'base_price': float(ride_type.base_price) if ride_type.base_price else None,
-                        'price_per_km': float(ride_type.price_per_km) if ride_type.price_per_km else None,
-                        'distance_km': round(distance_km, 2),
-                        'distance_miles': round(distance_km * 0.621371, 2),
-                        'surge_multiplier': float(surge_multiplier),
+                        'ride_type_name_large': ride_type['name_large'] or '',
+                        'ride_type_icon': ride_type['icon'] or '',
+                        'base_price': float(base_price),
+                        'price_per_km': float(price_per_km),
+                        'distance_km': distance_km_out,
+                        'distance_miles': distance_miles_out,
+                        'surge_multiplier': surge_out,
                         'estimated_price': price_f,
-                        'capacity': ride_type.capacity,
-                        'is_premium': ride_type.is_premium,
-                        'is_ev': ride_type.is_ev,
+                        'capacity': ride_type['capacity'],
+                        'is_premium': ride_type['is_premium'],
+                        'is_ev': ride_type['is_ev'],
                     })
                 except Exception as exc:
                     logger.exception(
-                        'price-estimate: skipped ride_type id=%s: %s', ride_type.id, exc
+                        'price-estimate: skipped ride_type id=%s: %s', ride_type['id'], exc
                     )
                     continue
 
             payload = {
-                'distance_km': round(distance_km, 2),
-                'distance_miles': round(distance_km * 0.621371, 2),
-                'surge_multiplier': float(surge_multiplier),
+                'distance_km': distance_km_out,
+                'distance_miles': distance_miles_out,
+                'surge_multiplier': surge_out,
                 'estimates': estimates,
             }
             if not estimates:
@@ -1631,7 +1775,7 @@ class PriceEstimateView(AsyncAPIView):
                 status=status.HTTP_200_OK
             )
         
-        errors = await sync_to_async(lambda: serializer.errors)()
+        errors = serializer.errors
         return Response(
             {
                 'message': 'Validation error',
@@ -1663,21 +1807,21 @@ class PriceEstimateManagePriceView(AsyncAPIView):
         serializer = PriceEstimateManagePriceSerializer(data=request.data)
         is_valid = await sync_to_async(lambda: serializer.is_valid())()
         if not is_valid:
-            errors = await sync_to_async(lambda: serializer.errors)()
+            errors = serializer.errors
             return Response(
                 {'message': 'Validation error', 'status': 'error', 'errors': errors},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = await sync_to_async(lambda: serializer.validated_data)()
-        lat_from = float(data['latitude_from'])
-        lon_from = float(data['longitude_from'])
-        lat_to = float(data['latitude_to'])
-        lon_to = float(data['longitude_to'])
+        data = serializer.validated_data
+        lat_from = data['latitude_from']
+        lon_from = data['longitude_from']
+        lat_to = data['latitude_to']
+        lon_to = data['longitude_to']
         ride_type_id = data['ride_type_id']
         adjusted = Decimal(str(data['adjusted_price']))
 
-        distance_km = await sync_to_async(calculate_distance)(lat_from, lon_from, lat_to, lon_to)
+        distance_km = calculate_distance(lat_from, lon_from, lat_to, lon_to)
         surge_multiplier = await sync_to_async(SurgePricingService.get_multiplier)(lat_from, lon_from)
 
         try:
@@ -1728,25 +1872,14 @@ class OrderItemUpdateView(AsyncAPIView):
     @extend_schema(tags=['Rider: Order items'], summary='Update order item', description='Update mutable order-item fields (for example ride_type) for an order owned by current rider.', request=OrderItemUpdateSerializer)
     async def patch(self, request, order_item_id):
         try:
-            order_item = await OrderItem.objects.select_related(
-                'order__user', 'ride_type'
-            ).aget(id=order_item_id)
-            if order_item.order.user != request.user:
-                return Response(
-                    {
-                        'message': 'Permission denied',
-                        'status': 'error'
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        except OrderItem.DoesNotExist:
-            return Response(
-                {
-                    'message': 'Order item not found',
-                    'status': 'error'
-                },
-                status=status.HTTP_404_NOT_FOUND
+            # Scoped to the caller: someone else's item is indistinguishable
+            # from a missing one. No joins: the order row is never read and
+            # the serializer replaces ride_type before anything renders it.
+            order_item = await OrderItem.objects.aget(
+                id=order_item_id, order__user_id=request.user.id,
             )
+        except OrderItem.DoesNotExist:
+            return _error_response('Order item not found', http_status=status.HTTP_404_NOT_FOUND)
         
         serializer = OrderItemUpdateSerializer(
             order_item, 
@@ -1758,11 +1891,9 @@ class OrderItemUpdateView(AsyncAPIView):
         is_valid = await sync_to_async(lambda: serializer.is_valid())()
         
         if is_valid:
-            updated_item = await sync_to_async(serializer.save)()
-            updated_item = await OrderItem.objects.select_related('ride_type').aget(pk=updated_item.pk)
-            
-            order_item_serializer = OrderItemSerializer(updated_item)
-            serializer_data = await sync_to_async(lambda: order_item_serializer.data)()
+            # save() recomputes prices in memory and ride_type is already attached,
+            # so the instance can be rendered without a second SELECT.
+            serializer_data = await _run_sync(lambda: OrderItemSerializer(serializer.save()).data)
             
             return Response(
                 {
@@ -1773,15 +1904,7 @@ class OrderItemUpdateView(AsyncAPIView):
                 status=status.HTTP_200_OK
             )
         
-        errors = await sync_to_async(lambda: serializer.errors)()
-        return Response(
-            {
-                'message': 'Validation error',
-                'status': 'error',
-                'errors': errors
-            },
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        return _error_response('Validation error', errors=serializer.errors)
 
 class OrderItemManagePriceView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
@@ -1799,115 +1922,102 @@ class OrderItemManagePriceView(AsyncAPIView):
     )
     async def patch(self, request, order_item_id):
         try:
-            order_item = await OrderItem.objects.select_related(
-                'order__user', 'ride_type'
-            ).aget(id=order_item_id)
-            if order_item.order.user != request.user:
-                return Response(
-                    {
-                        'message': 'Permission denied',
-                        'status': 'error'
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
+            # Scoped to the caller: someone else's item is indistinguishable
+            # from a missing one.
+            # Every OrderItem column is rendered; from ride_type only the name is.
+            order_item = await OrderItem.objects.select_related('ride_type').only(
+                *(f.name for f in OrderItem._meta.concrete_fields), 'ride_type__name',
+            ).aget(id=order_item_id, order__user_id=request.user.id)
         except OrderItem.DoesNotExist:
-            return Response(
-                {
-                    'message': 'Order item not found',
-                    'status': 'error'
-                },
-                status=status.HTTP_404_NOT_FOUND
-            )
+            return _error_response('Order item not found', http_status=status.HTTP_404_NOT_FOUND)
         
         serializer = OrderItemManagePriceSerializer(data=request.data)
         
-        is_valid = await sync_to_async(lambda: serializer.is_valid())()
+        is_valid = serializer.is_valid()
         
         if is_valid:
-            validated_data = await sync_to_async(lambda: serializer.validated_data)()
+            validated_data = serializer.validated_data
             adjusted_price = validated_data['adjusted_price']
             
             if not order_item.original_price:
-                return Response(
-                    {
-                        'message': 'Original price not set. Please set ride_type first.',
-                        'status': 'error'
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            if not order_item.min_price or not order_item.max_price:
-                min_price, max_price = await sync_to_async(order_item.calculate_price_range)()
-                order_item.min_price = min_price
-                order_item.max_price = max_price
-                await sync_to_async(order_item.save)()
+                return _error_response('Original price not set. Please set ride_type first.')
             
-            from decimal import Decimal
-            adjusted_price_decimal = Decimal(str(adjusted_price))
-            
-            if order_item.min_price and adjusted_price_decimal < order_item.min_price:
-                return Response(
-                    {
-                        'message': f'Price cannot be less than {order_item.min_price}',
-                        'status': 'error',
-                        'data': {
-                            'min_price': float(order_item.min_price),
-                            'max_price': float(order_item.max_price) if order_item.max_price else None,
-                            'original_price': float(order_item.original_price),
-                            'requested_price': float(adjusted_price)
-                        }
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            if order_item.max_price and adjusted_price_decimal > order_item.max_price:
+            from django.utils import timezone
+
+            # DecimalField already yields a Decimal; compare/store it as-is.
+            def _range_error(item):
+                if not item.min_price or not item.max_price:
+                    return 'Price range not set. Please set ride_type first.'
+                if adjusted_price < item.min_price:
+                    return f'Price cannot be less than {item.min_price}'
+                if adjusted_price > item.max_price:
+                    return f'Price cannot be more than {item.max_price}'
+                return None
+
+            def _range_error_response(item, message):
                 return Response(
                     {
-                        'message': f'Price cannot be more than {order_item.max_price}',
+                        'message': message,
                         'status': 'error',
                         'data': {
-                            'min_price': float(order_item.min_price),
-                            'max_price': float(order_item.max_price) if order_item.max_price else None,
-                            'original_price': float(order_item.original_price),
+                            'min_price': float(item.min_price) if item.min_price else None,
+                            'max_price': float(item.max_price) if item.max_price else None,
+                            'original_price': float(item.original_price) if item.original_price else None,
                             'requested_price': float(adjusted_price)
                         }
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            try:
-                await sync_to_async(order_item.adjust_price)(float(adjusted_price))
-                order_item = await OrderItem.objects.select_related('ride_type').aget(pk=order_item.pk)
-                
-                order_item_serializer = OrderItemSerializer(order_item)
-                serializer_data = await sync_to_async(lambda: order_item_serializer.data)()
-                
-                return Response(
-                    {
-                        'message': 'Price adjusted successfully',
-                        'status': 'success',
-                        'data': serializer_data
-                    },
-                    status=status.HTTP_200_OK
-                )
-            except ValueError as e:
-                return Response(
-                    {
-                        'message': str(e),
-                        'status': 'error'
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
+
+            # Reject against the row already loaded; no query on the error path.
+            message = _range_error(order_item)
+            if message:
+                return _range_error_response(order_item, message)
+
+            now = timezone.now()
+            price_adjustment_percentage = round(
+                (adjusted_price - order_item.original_price) / order_item.original_price * 100, 2
+            )
+
+            # The range is re-checked in the UPDATE itself, so a concurrent edit
+            # between the read above and this write cannot slip through.
+            updated = await OrderItem.objects.filter(
+                pk=order_item.pk,
+                min_price__lte=adjusted_price,
+                max_price__gte=adjusted_price,
+            ).aupdate(
+                adjusted_price=adjusted_price,
+                calculated_price=adjusted_price,
+                is_price_adjusted=True,
+                price_adjustment_percentage=price_adjustment_percentage,
+                updated_at=now,
+            )
+
+            if not updated:
+                current = await OrderItem.objects.only(
+                    'id', 'original_price', 'min_price', 'max_price'
+                ).aget(pk=order_item.pk)
+                return _range_error_response(
+                    current, _range_error(current) or 'Price range changed. Please retry.'
                 )
+
+            order_item.adjusted_price = adjusted_price
+            order_item.calculated_price = adjusted_price
+            order_item.is_price_adjusted = True
+            order_item.price_adjustment_percentage = price_adjustment_percentage
+            order_item.updated_at = now
+            serializer_data = await _run_sync(lambda: OrderItemSerializer(order_item).data)
+
+            return Response(
+                {
+                    'message': 'Price adjusted successfully',
+                    'status': 'success',
+                    'data': serializer_data
+                },
+                status=status.HTTP_200_OK
+            )
         
-        errors = await sync_to_async(lambda: serializer.errors)()
-        return Response(
-            {
-                'message': 'Validation error',
-                'status': 'error',
-                'errors': errors
-            },
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        return _error_response('Validation error', errors=serializer.errors)
 
 class OrderCancelView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
@@ -1915,85 +2025,76 @@ class OrderCancelView(AsyncAPIView):
     @extend_schema(tags=['Rider: Orders'], summary='Cancel order', description='Rider-initiated cancellation endpoint. Body: reason and optional other_reason. Writes cancellation meta and broadcasts updates to rider/driver sockets.', request=OrderCancelSerializer)
     async def post(self, request, order_id):
         try:
-            order = await Order.objects.select_related('user').aget(id=order_id)
-            if order.user != request.user:
-                return Response(
-                    {
-                        'message': 'Permission denied',
-                        'status': 'error'
-                    },
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        except Order.DoesNotExist:
-            return Response(
-                {
-                    'message': 'Order not found',
-                    'status': 'error'
-                },
-                status=status.HTTP_404_NOT_FOUND
+            order = await Order.objects.only('id', 'user', 'status').aget(
+                id=order_id, user_id=request.user.id,
             )
+        except Order.DoesNotExist:
+            return _error_response('Order not found', http_status=status.HTTP_404_NOT_FOUND)
         
         if order.status == Order.OrderStatus.CANCELLED:
-            return Response(
-                {
-                    'message': 'Order is already cancelled',
-                    'status': 'error'
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            return _error_response('Order is already cancelled')
         
         if order.status == Order.OrderStatus.COMPLETED:
-            return Response(
-                {
-                    'message': 'Cannot cancel a completed order',
-                    'status': 'error'
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            return _error_response('Cannot cancel a completed order')
         
         serializer = OrderCancelSerializer(data=request.data)
         
-        is_valid = await sync_to_async(lambda: serializer.is_valid())()
+        is_valid = serializer.is_valid()
         
         if is_valid:
-            validated_data = await sync_to_async(lambda: serializer.validated_data)()
+            validated_data = serializer.validated_data
             reason = validated_data['reason']
             other_reason = validated_data.get('other_reason', '')
             
+            def _cancel_order_and_record():
+                from django.db import transaction
+                from django.db.models import Case, IntegerField, Value, When
+                from django.utils import timezone
+
+                with transaction.atomic():
+                    # Conditional UPDATE: a concurrent cancel/complete wins the race
+                    # instead of being overwritten.
+                    updated = Order.objects.filter(pk=order.pk).exclude(
+                        status__in=(Order.OrderStatus.CANCELLED, Order.OrderStatus.COMPLETED),
+                    ).update(
+                        status=Order.OrderStatus.CANCELLED,
+                        updated_at=timezone.now(),
+                    )
+                    if not updated:
+                        return False
+                    # Accepted driver if any, otherwise the latest request row.
+                    order_driver_id = (
+                        OrderDriver.objects
+                        .filter(order=order)
+                        .order_by(
+                            Case(
+                                When(status=OrderDriver.DriverRequestStatus.ACCEPTED, then=Value(0)),
+                                default=Value(1),
+                                output_field=IntegerField(),
+                            ),
+                            '-created_at',
+                        )
+                        .values_list('id', flat=True)
+                        .first()
+                    )
+                    CancelOrder.objects.create(
+                        order=order,
+                        driver_id=order_driver_id,
+                        cancelled_by=CancelOrder.CancelledBy.RIDER,
+                        reason=reason,
+                        other_reason=other_reason if reason == CancelOrder.CancelReason.OTHER else None
+                    )
+                return True
+
+            if not await sync_to_async(_cancel_order_and_record)():
+                return _error_response('Order is already cancelled or completed')
             order.status = Order.OrderStatus.CANCELLED
-            await sync_to_async(order.save)()
             try:
                 from apps.chat.models import ChatRoom
                 await sync_to_async(lambda: ChatRoom.objects.filter(order=order).update(status=ChatRoom.RoomStatus.CANCEL))()
             except Exception as e:
                 import logging
                 logging.getLogger(__name__).error(f"Failed to update ChatRoom status for order {order.id}: {e}")
-            def _cancel_order_driver_for_record():
-                od = (
-                    OrderDriver.objects.select_related('driver')
-                    .filter(
-                        order=order,
-                        status=OrderDriver.DriverRequestStatus.ACCEPTED,
-                    )
-                    .first()
-                )
-                if od:
-                    return od
-                return (
-                    OrderDriver.objects.select_related('driver')
-                    .filter(order=order)
-                    .first()
-                )
-
-            order_driver = await sync_to_async(_cancel_order_driver_for_record)()
-            
-            await sync_to_async(CancelOrder.objects.create)(
-                order=order,
-                driver=order_driver,
-                cancelled_by=CancelOrder.CancelledBy.RIDER,
-                reason=reason,
-                other_reason=other_reason if reason == CancelOrder.CancelReason.OTHER else None
-            )
 
             try:
                 from apps.order.services.rider_orders_websocket import async_notify_rider_order_updated
@@ -2025,13 +2126,15 @@ class OrderCancelView(AsyncAPIView):
                     e,
                 )
 
-            order = await Order.objects.select_related('user').prefetch_related(
-                'order_items__ride_type',
-                'order_drivers__driver'
-            ).aget(pk=order.pk)
-            
-            order_serializer = OrderSerializer(order, context={'request': request})
-            serializer_data = await sync_to_async(lambda: order_serializer.data)()
+            def _serialize_cancelled_order():
+                # OrderSerializer does not render order_drivers, so only the items are
+                # prefetched (a pending order can carry many driver request rows).
+                cancelled = Order.objects.select_related('user', 'saved_card').prefetch_related(
+                    Prefetch('order_items', queryset=OrderItem.objects.select_related('ride_type')),
+                ).get(pk=order.pk)
+                return OrderSerializer(cancelled, context={'request': request}).data
+
+            serializer_data = await _run_sync(_serialize_cancelled_order)
             
             return Response(
                 {
@@ -2042,15 +2145,21 @@ class OrderCancelView(AsyncAPIView):
                 status=status.HTTP_200_OK
             )
         
-        errors = await sync_to_async(lambda: serializer.errors)()
-        return Response(
-            {
-                'message': 'Validation error',
-                'status': 'error',
-                'errors': errors
-            },
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        return _error_response('Validation error', errors=serializer.errors)
+
+
+def _serialize_own_orders(orders, request):
+    """
+    Serialize a page of request.user's own orders. All rows share the one
+    user instance (groups prefetched once), so UserDetailSerializer and the
+    client rating stats load once per page instead of once per order.
+    """
+    user = request.user
+    prefetch_related_objects([user], 'groups')
+    for order in orders:
+        order.user = user
+    return OrderSerializer(orders, many=True, context={'request': request}).data
+
 
 class MyOrderListView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
@@ -2058,30 +2167,25 @@ class MyOrderListView(AsyncAPIView):
     @extend_schema(
         tags=['Rider: Orders'],
         summary='My orders',
-        description="Get current user's orders. Optional query: status, order_type, page, page_size.",
-        parameters=[
-            OpenApiParameter('status', OpenApiTypes.STR, OpenApiParameter.QUERY, required=False, description='Filter by order status'),
-            OpenApiParameter('order_type', OpenApiTypes.STR, OpenApiParameter.QUERY, required=False, description='Filter by order type'),
-            OpenApiParameter('page', OpenApiTypes.INT, OpenApiParameter.QUERY, required=False, description='Page number'),
-            OpenApiParameter('page_size', OpenApiTypes.INT, OpenApiParameter.QUERY, required=False, description='Page size'),
-        ],
+        description=(
+            "Get current user's orders. Optional query: status, order_type, page, page_size. "
+            "Pass ``cursor`` (empty for the first page) to switch to keyset pagination: "
+            "the response then has ``next``/``previous`` links and no ``count``."
+        ),
+        parameters=MY_ORDER_LIST_PARAMETERS,
     )
     async def get(self, request):
-        from rest_framework.pagination import PageNumberPagination
-        
+        # Only what OrderSerializer renders. ``user`` is not joined: every row
+        # belongs to request.user, which _serialize_own_orders attaches.
         orders_queryset = Order.objects.filter(user=request.user).select_related(
-            'user', 'saved_card'
+            'saved_card'
         ).prefetch_related(
-            'order_items__ride_type',
-            'order_preferences',
-            'order_drivers__driver',
-            'additional_passengers',
+            Prefetch('order_items', queryset=OrderItem.objects.select_related('ride_type')),
         ).order_by('-created_at')
         
         status_filter = request.query_params.get('status', None)
         if status_filter:
-            status_choices = await sync_to_async(lambda: [choice[0] for choice in Order.OrderStatus.choices])()
-            if status_filter in status_choices:
+            if status_filter in ORDER_STATUS_CHOICES:
                 orders_queryset = orders_queryset.filter(status=status_filter)
             else:
                 return Response(
@@ -2089,7 +2193,7 @@ class MyOrderListView(AsyncAPIView):
                         'message': 'Invalid status value',
                         'status': 'error',
                         'errors': {
-                            'status': f'Must be one of: {", ".join(status_choices)}'
+                            'status': ORDER_STATUS_CHOICES_HINT
                         }
                     },
                     status=status.HTTP_400_BAD_REQUEST
@@ -2097,8 +2201,7 @@ class MyOrderListView(AsyncAPIView):
         
         order_type_filter = request.query_params.get('order_type', None)
         if order_type_filter:
-            order_type_choices = await sync_to_async(lambda: [choice[0] for choice in Order.OrderType.choices])()
-            if order_type_filter in order_type_choices:
+            if order_type_filter in ORDER_TYPE_CHOICES:
                 orders_queryset = orders_queryset.filter(order_type=order_type_filter)
             else:
                 return Response(
@@ -2106,41 +2209,43 @@ class MyOrderListView(AsyncAPIView):
                         'message': 'Invalid order_type value',
                         'status': 'error',
                         'errors': {
-                            'order_type': f'Must be one of: {", ".join(order_type_choices)}'
+                            'order_type': ORDER_TYPE_CHOICES_HINT
                         }
                     },
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        orders = await sync_to_async(list)(orders_queryset)
-        
-        paginator = PageNumberPagination()
-        paginator.page_size = int(request.query_params.get('page_size', 10))
-        paginated_orders = await sync_to_async(paginator.paginate_queryset)(orders, request)
-        
-        if paginated_orders is not None:
-            serializer = OrderSerializer(paginated_orders, many=True, context={'request': request})
-            serializer_data = await sync_to_async(lambda: serializer.data)()
-            
-            response = await sync_to_async(paginator.get_paginated_response)(serializer_data)
-            response.data['message'] = 'Orders retrieved successfully'
-            response.data['status'] = 'success'
-            response.data['data'] = response.data.pop('results')
-            return response
-        
-        serializer = OrderSerializer(orders, many=True, context={'request': request})
-        serializer_data = await sync_to_async(lambda: serializer.data)()
-        orders_count = await sync_to_async(len)(orders)
-        
-        return Response(
-            {
-                'message': 'Orders retrieved successfully',
-                'status': 'success',
-                'count': orders_count,
-                'data': serializer_data
-            },
-            status=status.HTTP_200_OK
-        )
+        if 'cursor' in request.query_params:
+            # Keyset pagination: an index seek on (user, created_at, id), no COUNT(*).
+            cursor_paginator = OrderCursorPagination()
+
+            def _cursor_page():
+                page = cursor_paginator.paginate_queryset(orders_queryset, request, view=self)
+                return _serialize_own_orders(page, request)
+
+            serializer_data = await _run_sync(_cursor_page)
+            return Response(
+                {
+                    'message': 'Orders retrieved successfully',
+                    'status': 'success',
+                    'next': cursor_paginator.get_next_link(),
+                    'previous': cursor_paginator.get_previous_link(),
+                    'data': serializer_data
+                },
+                status=status.HTTP_200_OK
+            )
+
+        # page_size is parsed and clamped by the paginator (1..100, default 10);
+        # on the queryset it issues COUNT(*) + LIMIT/OFFSET.
+        paginator = OrderPageNumberPagination()
+
+        def _page():
+            page = paginator.paginate_queryset(orders_queryset, request)
+            return _serialize_own_orders(page, request)
+
+        serializer_data = await _run_sync(_page)
+
+        return paginator.get_paginated_response(serializer_data)
 
 
 class RiderRideHistoryView(AsyncAPIView):
@@ -2186,15 +2291,8 @@ class RiderRideHistoryView(AsyncAPIView):
         responses={200: OrderSerializer(many=True)},
     )
     async def get(self, request):
-        from rest_framework.pagination import PageNumberPagination
-
-        allowed_statuses = {
-            Order.OrderStatus.COMPLETED,
-            Order.OrderStatus.CANCELLED,
-            Order.OrderStatus.REJECTED,
-        }
         status_filter = request.query_params.get('status', Order.OrderStatus.COMPLETED)
-        if status_filter not in allowed_statuses:
+        if status_filter not in RIDE_HISTORY_STATUSES:
             return Response(
                 {
                     'message': 'Invalid status value',
@@ -2221,46 +2319,26 @@ class RiderRideHistoryView(AsyncAPIView):
 
         order_type_filter = request.query_params.get('order_type')
         if order_type_filter:
-            order_type_choices = await sync_to_async(
-                lambda: [choice[0] for choice in Order.OrderType.choices]
-            )()
-            if order_type_filter not in order_type_choices:
+            if order_type_filter not in ORDER_TYPE_CHOICES:
                 return Response(
                     {
                         'message': 'Invalid order_type value',
                         'status': 'error',
                         'errors': {
-                            'order_type': f'Must be one of: {", ".join(order_type_choices)}'
+                            'order_type': ORDER_TYPE_CHOICES_HINT
                         },
                     },
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             qs = qs.filter(order_type=order_type_filter)
 
-        orders = await sync_to_async(list)(qs)
-        paginator = PageNumberPagination()
-        paginator.page_size = int(request.query_params.get('page_size', 10))
-        paginated_orders = await sync_to_async(paginator.paginate_queryset)(orders, request)
+        paginator = OrderPageNumberPagination()
+        paginated_orders = await sync_to_async(paginator.paginate_queryset)(qs, request)
 
-        if paginated_orders is not None:
-            serializer = OrderSerializer(paginated_orders, many=True, context={'request': request})
-            serializer_data = await sync_to_async(lambda: serializer.data)()
-            response = await sync_to_async(paginator.get_paginated_response)(serializer_data)
-            response.data['message'] = 'Ride history retrieved successfully'
-            response.data['status'] = 'success'
-            response.data['data'] = response.data.pop('results')
-            return response
-
-        serializer = OrderSerializer(orders, many=True, context={'request': request})
+        serializer = OrderSerializer(paginated_orders, many=True, context={'request': request})
         serializer_data = await sync_to_async(lambda: serializer.data)()
-        return Response(
-            {
-                'message': 'Ride history retrieved successfully',
-                'status': 'success',
-                'count': len(orders),
-                'data': serializer_data,
-            },
-            status=status.HTTP_200_OK,
+        return paginator.get_paginated_response(
+            serializer_data, message='Ride history retrieved successfully'
         )
 
 
@@ -2271,15 +2349,10 @@ class OrderDetailView(AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     async def _can_access_order(self, user, order):
         if order.user_id == user.id:
             return True
-        if not await self._check_driver_role(user):
+        if not await _is_driver(user):
             return False
         return await OrderDriver.objects.filter(order=order, driver=user).aexists()
 
@@ -2333,15 +2406,10 @@ class OrderCheckoutPreviewView(AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     async def _can_access_order(self, user, order):
         if order.user_id == user.id:
             return True
-        if not await self._check_driver_role(user):
+        if not await _is_driver(user):
             return False
         return await OrderDriver.objects.filter(order=order, driver=user).aexists()
 
@@ -2583,7 +2651,7 @@ class DriverDashboardView(AsyncAPIView):
     )
     async def get(self, request):
         user = request.user
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response({'message': 'Only drivers can access this endpoint', 'status': 'error'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -2591,9 +2659,17 @@ class DriverDashboardView(AsyncAPIView):
         filter_type = request.query_params.get('filter', 'last_30')
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
-        overview, cash_history, ride_history = await sync_to_async(get_driver_dashboard)(
-            user.id, ride_limit, filter_type, start_date, end_date
-        )
+
+        # The Stripe Connect lookup is pure HTTP (no ORM), so it runs on its own
+        # worker thread while the DB work below uses the shared sync thread.
+        stripe_task = asyncio.ensure_future(self._fetch_stripe_balance(user))
+        try:
+            overview, cash_history, ride_history = await sync_to_async(get_driver_dashboard)(
+                user.id, ride_limit, filter_type, start_date, end_date
+            )
+        except BaseException:
+            stripe_task.cancel()
+            raise
 
         # Wallet: available balance (withdrawable = card + hola_wallet_cash; cash is not withdrawable)
         wallet_summary = None
@@ -2617,14 +2693,7 @@ class DriverDashboardView(AsyncAPIView):
             wallet_summary = None
             cash_out_available = "0.00"
 
-        # Stripe Connect balance (pending / available) — automatic weekly bank payouts
-        stripe_balance = None
-        try:
-            from apps.payment.services.connect_balance import fetch_connect_balance_and_payouts
-
-            stripe_balance = await sync_to_async(fetch_connect_balance_and_payouts)(user, payout_limit=5)
-        except Exception:
-            stripe_balance = None
+        stripe_balance = await stripe_task
 
         return Response({
             'message': 'Dashboard retrieved successfully',
@@ -2639,10 +2708,22 @@ class DriverDashboardView(AsyncAPIView):
             },
         }, status=status.HTTP_200_OK)
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
+    async def _fetch_stripe_balance(self, user):
+        """Stripe Connect balance (pending / available) — automatic weekly bank payouts."""
+        try:
+            from apps.payment.services.connect_balance import fetch_connect_balance_and_payouts
+
+            # Safe off the request thread: the function makes only Stripe API
+            # calls (Balance.retrieve, Payout.list) and settings reads; from
+            # ``user`` it reads stripe_connect_account_id, which the
+            # authentication query loaded (nothing is deferred). No DB
+            # connection is opened on the executor thread. If it ever needs
+            # the ORM, drop thread_sensitive=False.
+            return await sync_to_async(fetch_connect_balance_and_payouts, thread_sensitive=False)(
+                user, payout_limit=5
+            )
+        except Exception:
+            return None
 
 
 class DriverEarningsView(AsyncAPIView):
@@ -2650,11 +2731,6 @@ class DriverEarningsView(AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(
         tags=['Driver: Earnings & wallet'],
         summary='Driver earnings',
@@ -2675,7 +2751,7 @@ class DriverEarningsView(AsyncAPIView):
     )
     async def get(self, request):
         user = request.user
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response(
                 {'message': 'Only drivers can access this endpoint', 'status': 'error'},
@@ -2689,8 +2765,7 @@ class DriverEarningsView(AsyncAPIView):
             today_target = 10
 
         payload = await sync_to_async(get_driver_earnings)(user.id, today_target=today_target)
-        serializer = DriverEarningsSerializer(instance=SimpleNamespace(**payload))
-        data = await sync_to_async(lambda: serializer.data)()
+        data = DriverEarningsSerializer(instance=SimpleNamespace(**payload)).data
         return Response(
             {
                 'message': 'Earnings retrieved successfully',
@@ -2701,7 +2776,6 @@ class DriverEarningsView(AsyncAPIView):
         )
 
 
-
 class DriverCashoutHistoryView(AsyncAPIView):
     """Automatic Stripe Connect bank payout history (weekly deposits)."""
     permission_classes = [IsAuthenticated]
@@ -2720,7 +2794,7 @@ class DriverCashoutHistoryView(AsyncAPIView):
     )
     async def get(self, request):
         user = request.user
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response({'message': 'Only drivers can access this endpoint', 'status': 'error'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -2736,11 +2810,6 @@ class DriverCashoutHistoryView(AsyncAPIView):
             'data': data,
         }, status=status.HTTP_200_OK)
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
 
 class DriverCashoutCreateView(AsyncAPIView):
     """Create cashout request. Figma: Cash out button."""
@@ -2761,7 +2830,7 @@ class DriverCashoutCreateView(AsyncAPIView):
     )
     async def post(self, request):
         user = request.user
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response({'message': 'Only drivers can access this endpoint', 'status': 'error'}, status=status.HTTP_403_FORBIDDEN)
         amount = request.data.get('amount')
@@ -2847,11 +2916,6 @@ class DriverCashoutCreateView(AsyncAPIView):
         data = await sync_to_async(lambda: DriverCashoutSerializer(cashout).data)()
         return Response({'message': 'Cashout request submitted successfully', 'status': 'success', 'data': data}, status=status.HTTP_201_CREATED)
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
 
 class DriverCashoutsListCreateView(AsyncAPIView):
     """
@@ -2881,20 +2945,10 @@ class DriverCashoutsListCreateView(AsyncAPIView):
         view = DriverCashoutCreateView()
         return await view.post(request)
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
 
 class DriverRideHistoryView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(
         tags=['Driver: Earnings & wallet'],
         summary='Ride history (See all)',
@@ -2910,7 +2964,7 @@ class DriverRideHistoryView(AsyncAPIView):
     )
     async def get(self, request):
         user = request.user
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response({'message': 'Only drivers can access this endpoint', 'status': 'error'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -2933,16 +2987,13 @@ class DriverRideHistoryView(AsyncAPIView):
 class DriverOnlineStatusView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    async def _check_driver_role(self, user):
-        groups = await sync_to_async(list)(user.groups.all())
-        names = [g.name for g in groups]
-        return 'Driver' in names
-
     @extend_schema(tags=['Driver: Availability'], summary='Online status (GET)', description='Read current availability flag for the authenticated driver (`is_online`). Driver role required.')
     async def get(self, request):
         user = request.user
 
-        is_driver = await self._check_driver_role(user)
+        # The authenticated user row was loaded for this request and the
+        # role is annotated at authentication, so no extra query is needed.
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response(
                 {
@@ -2952,10 +3003,7 @@ class DriverOnlineStatusView(AsyncAPIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        user = await CustomUser.objects.aget(id=user.id)
-
-        serializer = DriverOnlineStatusSerializer({'is_online': user.is_online})
-        data = await sync_to_async(lambda: serializer.data)()
+        data = DriverOnlineStatusSerializer({'is_online': user.is_online}).data
 
         return Response(
             {
@@ -2970,7 +3018,7 @@ class DriverOnlineStatusView(AsyncAPIView):
     async def post(self, request):
         user = request.user
 
-        is_driver = await self._check_driver_role(user)
+        is_driver = await _is_driver(user)
         if not is_driver:
             return Response(
                 {
@@ -2981,10 +3029,10 @@ class DriverOnlineStatusView(AsyncAPIView):
             )
 
         serializer = DriverOnlineStatusSerializer(data=request.data)
-        is_valid = await sync_to_async(lambda: serializer.is_valid())()
+        is_valid = serializer.is_valid()
         
         if not is_valid:
-            errors = await sync_to_async(lambda: serializer.errors)()
+            errors = serializer.errors
             return Response(
                 {
                     'message': 'Validation error',
@@ -2994,14 +3042,13 @@ class DriverOnlineStatusView(AsyncAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = await sync_to_async(lambda: serializer.validated_data)()
+        data = serializer.validated_data
         is_online = data['is_online']
 
+        await CustomUser.objects.filter(id=user.id).aupdate(is_online=is_online)
         user.is_online = is_online
-        await sync_to_async(user.save)(update_fields=['is_online'])
 
-        response_serializer = DriverOnlineStatusSerializer({'is_online': user.is_online})
-        response_data = await sync_to_async(lambda: response_serializer.data)()
+        response_data = DriverOnlineStatusSerializer({'is_online': is_online}).data
 
         return Response(
             {
@@ -3019,11 +3066,13 @@ class TripRatingCreateView(AsyncAPIView):
     async def post(self, request):
         user = request.user
 
+        # Field checks only; the DB-backed rules are enforced below against
+        # the single order/tag lookups, so no thread-pool hop is needed here.
         serializer = TripRatingCreateSerializer(data=request.data)
-        is_valid = await sync_to_async(lambda: serializer.is_valid())()
+        is_valid = serializer.is_valid()
         
         if not is_valid:
-            errors = await sync_to_async(lambda: serializer.errors)()
+            errors = serializer.errors
             return Response(
                 {
                     'message': 'Validation error',
@@ -3033,40 +3082,81 @@ class TripRatingCreateView(AsyncAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        validated_data = await sync_to_async(lambda: serializer.validated_data)()
+        validated_data = serializer.validated_data
         order_id = validated_data['order_id']
         rating = validated_data['rating']
         comment = validated_data.get('comment')
         tip_amount = validated_data.get('tip_amount', 0)
         feedback_tag_ids = validated_data.get('feedback_tag_ids', [])
 
-        try:
-            order = await Order.objects.select_related('user').prefetch_related(
-                'order_drivers__driver'
-            ).aget(id=order_id)
-        except Order.DoesNotExist:
+        # Order, its accepted driver row (joined, with the driver) and whether
+        # it is already rated, in one query.
+        order = await Order.objects.annotate(
+            accepted_order_driver=FilteredRelation(
+                'order_drivers',
+                condition=Q(order_drivers__status=OrderDriver.DriverRequestStatus.ACCEPTED),
+            ),
+            is_rated=Exists(TripRating.objects.filter(order=OuterRef('pk'))),
+        ).select_related('accepted_order_driver__driver').filter(id=order_id).afirst()
+        # Ownership is checked before the order's state so a non-owner learns
+        # nothing about someone else's order (the old serializer reported
+        # status/already-rated errors first).
+        if order is not None and order.user_id != user.id:
             return Response(
                 {
-                    'message': 'Order not found',
+                    'message': 'You can only rate your own orders',
                     'status': 'error',
                 },
-                status=status.HTTP_404_NOT_FOUND,
+                status=status.HTTP_403_FORBIDDEN,
             )
 
-        if order.user != user:
+        # Collected like serializer field errors, so every problem is reported at once.
+        errors = {}
+        if order is None:
+            errors['order_id'] = ['Order not found.']
+        elif order.status != Order.OrderStatus.COMPLETED:
+            errors['order_id'] = ['Can only rate completed orders.']
+        elif order.is_rated:
+            errors['order_id'] = ['This order has already been rated.']
+
+        tag_ids = []
+        if feedback_tag_ids:
+            from apps.order.models import RatingFeedbackTag
+            tags = [
+                tag async for tag in RatingFeedbackTag.objects.filter(
+                    id__in=feedback_tag_ids, is_active=True, rating_target='rider_to_driver'
+                ).only('id', 'name', 'tag_type')
+            ]
+            expected_tag_type = 'positive' if rating >= 4 else 'negative'
+            tag_error = None
+            if len(tags) != len(feedback_tag_ids):
+                tag_error = 'Some feedback tags are invalid, inactive, or not for rider→driver rating.'
+            else:
+                for tag in tags:
+                    if tag.tag_type != expected_tag_type:
+                        tag_error = (
+                            f"Tag '{tag.name}' is {tag.get_tag_type_display()} but rating is {rating} stars. "
+                            f"Use {expected_tag_type} tags for {rating} star rating."
+                        )
+                        break
+            if tag_error:
+                errors['feedback_tag_ids'] = [tag_error]
+            tag_ids = [tag.id for tag in tags]
+
+        if errors:
             return Response(
                 {
-                    'message': 'You can only rate your own orders',
+                    'message': 'Validation error',
                     'status': 'error',
+                    'errors': errors,
                 },
-                status=status.HTTP_403_FORBIDDEN,
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        order_driver = await sync_to_async(
-            lambda: order.order_drivers.filter(status=OrderDriver.DriverRequestStatus.ACCEPTED).first()
-        )()
-        
-        if not order_driver or not order_driver.driver:
+        # Django leaves the attribute unset when the filtered join found no row.
+        accepted_order_driver = getattr(order, 'accepted_order_driver', None)
+        driver = accepted_order_driver.driver if accepted_order_driver else None
+        if driver is None:
             return Response(
                 {
                     'message': 'No driver found for this order',
@@ -3075,8 +3165,6 @@ class TripRatingCreateView(AsyncAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        driver = order_driver.driver
-
         trip_rating = await sync_to_async(TripRating.objects.create)(
             order=order,
             rider=user,
@@ -3086,21 +3174,18 @@ class TripRatingCreateView(AsyncAPIView):
             tip_amount=tip_amount or 0,
         )
 
-        if feedback_tag_ids:
-            from apps.order.models import RatingFeedbackTag
-            tags = await sync_to_async(list)(
-                RatingFeedbackTag.objects.filter(
-                    id__in=feedback_tag_ids, is_active=True, rating_target='rider_to_driver'
-                )
-            )
-            await sync_to_async(trip_rating.feedback_tags.set)(tags)
-
-        trip_rating = await TripRating.objects.select_related(
-            'order', 'rider', 'driver'
-        ).prefetch_related('feedback_tags').aget(pk=trip_rating.pk)
-
-        response_serializer = TripRatingSerializer(trip_rating, context={'request': request})
-        response_data = await sync_to_async(lambda: response_serializer.data)()
+        if tag_ids:
+            # New rating, nothing to diff against: one INSERT into the through table.
+            Through = TripRating.feedback_tags.through
+            await Through.objects.abulk_create([
+                Through(triprating_id=trip_rating.pk, ratingfeedbacktag_id=tag_id)
+                for tag_id in tag_ids
+            ])
+
+        # order/rider/driver are already on the instance; only the tags are read back.
+        response_data = await _run_sync(
+            lambda: TripRatingSerializer(trip_rating, context={'request': request}).data
+        )
 
         return Response(
             {
@@ -3130,10 +3215,14 @@ def _create_driver_rider_rating(user_id, order_id, rating, comment, feedback_tag
     )
     if feedback_tag_ids:
         from apps.order.models import RatingFeedbackTag
-        tags = list(RatingFeedbackTag.objects.filter(
+        tag_ids = RatingFeedbackTag.objects.filter(
             id__in=feedback_tag_ids, is_active=True, rating_target='driver_to_rider'
-        ))
-        dr_rating.feedback_tags.set(tags)
+        ).values_list('id', flat=True)
+        Through = DriverRiderRating.feedback_tags.through
+        Through.objects.bulk_create([
+            Through(driverriderrating_id=dr_rating.pk, ratingfeedbacktag_id=tag_id)
+            for tag_id in tag_ids
+        ])
 
     dr_rating = DriverRiderRating.objects.select_related('order', 'driver', 'rider').prefetch_related('feedback_tags').get(pk=dr_rating.pk)
     response_serializer = DriverRiderRatingSerializer(dr_rating)
@@ -3159,13 +3248,13 @@ class DriverRiderRatingCreateView(AsyncAPIView):
         is_valid = await sync_to_async(lambda: serializer.is_valid())()
 
         if not is_valid:
-            errors = await sync_to_async(lambda: serializer.errors)()
+            errors = serializer.errors
             return Response(
                 {'message': 'Validation error', 'status': 'error', 'errors': errors},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        validated_data = await sync_to_async(lambda: serializer.validated_data)()
+        validated_data = serializer.validated_data
         order_id = validated_data['order_id']
         rating = validated_data['rating']
         comment = validated_data.get('comment')
@@ -3210,6 +3299,12 @@ class DriverRiderRatingCreateView(AsyncAPIView):
         )
 
 
+# 1-3 stars -> negative tags, 4-5 -> positive; anything else is invalid.
+_FEEDBACK_TAG_TYPE_BY_RATING = {
+    1: 'negative', 2: 'negative', 3: 'negative', 4: 'positive', 5: 'positive',
+}
+
+
 class RatingFeedbackTagsListView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
@@ -3223,45 +3318,23 @@ class RatingFeedbackTagsListView(AsyncAPIView):
         ],
     )
     async def get(self, request):
-        rating = request.query_params.get('rating')
         target = request.query_params.get('target')
 
-        if not rating:
-            return Response(
-                {'message': 'Rating parameter is required', 'status': 'error'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        if not target or target not in ('rider_to_driver', 'driver_to_rider'):
-            return Response(
-                {'message': 'Target must be rider_to_driver or driver_to_rider', 'status': 'error'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         try:
-            rating = int(rating)
-        except (ValueError, TypeError):
+            rating = int(request.query_params.get('rating', ''))
+            tag_type = _FEEDBACK_TAG_TYPE_BY_RATING[rating]
+        except (ValueError, TypeError, KeyError):
             return Response(
-                {'message': 'Rating must be a number between 1 and 5', 'status': 'error'},
+                {'message': 'Rating must be an integer between 1 and 5', 'status': 'error'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
-        if rating < 1 or rating > 5:
+        if target not in ('rider_to_driver', 'driver_to_rider'):
             return Response(
-                {'message': 'Rating must be between 1 and 5', 'status': 'error'},
+                {'message': 'Target must be rider_to_driver or driver_to_rider', 'status': 'error'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        tag_type = 'positive' if rating >= 4 else 'negative'
-
-        from apps.order.models import RatingFeedbackTag
-        tags = await sync_to_async(list)(
-            RatingFeedbackTag.objects.filter(
-                tag_type=tag_type, rating_target=target, is_active=True
-            ).order_by('name')
-        )
-
-        tag_serializer = RatingFeedbackTagSerializer(tags, many=True)
-        tag_data = await sync_to_async(lambda: tag_serializer.data)()
+        tag_data = await sync_to_async(get_feedback_tags)(tag_type, target)
 
         return Response(
             {
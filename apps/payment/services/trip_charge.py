@@ -29,7 +29,7 @@ def order_trip_total_money(order: 'Order') -> Decimal:
     for item in order.order_items.all():
         p = item.adjusted_price or item.calculated_price or item.original_price
         if p is not None:
-            total += Decimal(str(p))
+            total += p
     return total.quantize(Decimal('0.01'), ROUND_HALF_UP)
 
 
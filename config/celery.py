@@ -26,7 +26,13 @@ if sys.platform == 'win32':
 app.conf.beat_schedule = {
     'check-order-timeouts': {
         'task': 'apps.order.tasks.check_order_timeouts',
-        'schedule': 5.0,  # Har 5 soniyada ishlaydi
+        # Each request is expired by its own countdown task
+        # (expire_order_driver_request); this sweep only catches lost ones.
+        'schedule': 60.0,
+    },
+    'flush-driver-locations': {
+        'task': 'apps.order.tasks.flush_driver_locations',
+        'schedule': float(os.getenv('DRIVER_LOCATION_FLUSH_SECONDS', '15')),
     },
 }
 
@@ -4,18 +4,23 @@ Custom context processors for Django templates
 from django.conf import settings
 
 
-def websocket_url(request):
-    """Add websocket_url to all template contexts."""
+def _configured_websocket_url():
     websocket_url_value = getattr(settings, 'WEBSOCKET_URL', None)
+    if websocket_url_value:
+        return websocket_url_value
     websocket_host = getattr(settings, 'WEBSOCKET_HOST', None)
     websocket_port = getattr(settings, 'WEBSOCKET_PORT', None)
+    if websocket_host and websocket_port:
+        return f'{websocket_host}:{websocket_port}'
+    return None
+
 
-    if not websocket_url_value:
-        if websocket_host and websocket_port:
-            websocket_url_value = f'{websocket_host}:{websocket_port}'
-        else:
-            websocket_url_value = request.get_host()
+# Settings don't change at runtime; resolve once when the processor is loaded.
+_STATIC_WS_URL = _configured_websocket_url()
 
+
+def websocket_url(request):
+    """Add websocket_url to all template contexts."""
     return {
-        'websocket_url': websocket_url_value
+        'websocket_url': _STATIC_WS_URL or request.get_host()
     }
@@ -1,6 +1,5 @@
 import logging
 from channels.middleware import BaseMiddleware
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from channels.db import database_sync_to_async
 from channels.sessions import SessionMiddleware
@@ -9,6 +8,8 @@ from django.contrib.sessions.models import Session
 import jwt
 from urllib.parse import parse_qs, unquote
 
+from apps.common.authentication import RoleAwareJWTAuthentication
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +21,7 @@ def get_user_from_jwt(token_key):
     if token_key.lower().startswith("bearer "):
         token_key = token_key[7:].strip()
     try:
-        jwt_auth = JWTAuthentication()
+        jwt_auth = RoleAwareJWTAuthentication()
         validated_token = jwt_auth.get_validated_token(token_key)
         user = jwt_auth.get_user(validated_token)
         return user
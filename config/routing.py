@@ -5,15 +5,28 @@ from apps.order import consumers as order_consumers
 from apps.voice_call import consumers as voice_call_consumers
 
 websocket_urlpatterns = [
-    re_path(r"^ws/chat/(?P<conversation_id>\d+)(?:/.*)?/?$", consumers.ChatConsumer.as_asgi()),
-    re_path(r"^ws/support/(?P<room_id>\d+)(?:/.*)?/?$", SupportChatConsumer.as_asgi()),
-    re_path(r"^ws/notifications(?:/.*)?/?$", consumers.NotificationConsumer.as_asgi()),
-    re_path(r"^ws/voice-call(?:/.*)?/?$", voice_call_consumers.VoiceCallConsumer.as_asgi()),
-    re_path(r"^ws/driver/orders(?:/.*)?/?$", order_consumers.DriverOrdersConsumer.as_asgi()),
+    re_path(r"^ws/chat/(?P<conversation_id>\d+)(?:/.*)?$", consumers.ChatConsumer.as_asgi()),
+    re_path(r"^ws/support/(?P<room_id>\d+)(?:/.*)?$", SupportChatConsumer.as_asgi()),
+    re_path(r"^ws/notifications(?:/.*)?$", consumers.NotificationConsumer.as_asgi()),
+    re_path(r"^ws/voice-call(?:/.*)?$", voice_call_consumers.VoiceCallConsumer.as_asgi()),
+    re_path(r"^ws/driver/orders(?:/.*)?$", order_consumers.DriverOrdersConsumer.as_asgi()),
     # Alias: some clients use singular "order"; same consumer as /ws/driver/orders/
-    re_path(r"^ws/driver/order(?:/.*)?/?$", order_consumers.DriverOrdersConsumer.as_asgi()),
-    re_path(r"^ws/rider/orders(?:/.*)?/?$", order_consumers.RiderOrdersConsumer.as_asgi()),
-    re_path(r"^ws/order/(?P<order_id>\d+)/tracking(?:/.*)?/?$", order_consumers.OrderTrackingConsumer.as_asgi()),
-    re_path(r"^ws/driver/surge-zones(?:/.*)?/?$", order_consumers.DriverSurgeZonesConsumer.as_asgi()),
-    re_path(r"^ws/order/(?P<order_id>\d+)/chat(?:/.*)?/?$", order_consumers.OrderChatConsumer.as_asgi()),
+    re_path(r"^ws/driver/order(?:/.*)?$", order_consumers.DriverOrdersConsumer.as_asgi()),
+    re_path(r"^ws/rider/orders(?:/.*)?$", order_consumers.RiderOrdersConsumer.as_asgi()),
+    re_path(r"^ws/order/(?P<order_id>\d+)/tracking(?:/.*)?$", order_consumers.OrderTrackingConsumer.as_asgi()),
+    re_path(r"^ws/driver/surge-zones(?:/.*)?$", order_consumers.DriverSurgeZonesConsumer.as_asgi()),
+    re_path(r"^ws/order/(?P<order_id>\d+)/chat(?:/.*)?$", order_consumers.OrderChatConsumer.as_asgi()),
 ]
+
+
+def _compile_patterns(patterns):
+    """
+    Django compiles each pattern on first match; do it at import so the first
+    handshake in every worker doesn't pay for it.
+    """
+    for route in patterns:
+        # Reading ``regex`` compiles the pattern and caches it on the route.
+        _ = route.pattern.regex
+
+
+_compile_patterns(websocket_urlpatterns)
@@ -57,14 +57,19 @@ THIRD_PARTY_APPS = [
     *LOCAL_APPS,
 ]
 
+# API-only processes can run without the Django admin (ENABLE_ADMIN=false),
+# which also drops the messages framework it needs. Sessions stay: the
+# WebSocket stack authenticates admin-panel sockets from the session cookie.
+ENABLE_ADMIN = os.getenv('ENABLE_ADMIN', 'true').lower() == 'true'
+
 INSTALLED_APPS = [
     "daphne",
-    'django.contrib.admin',
+    *(['django.contrib.admin'] if ENABLE_ADMIN else []),
     'django.contrib.sites',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
-    'django.contrib.messages',
+    *(['django.contrib.messages'] if ENABLE_ADMIN else []),
     'django.contrib.staticfiles',
     'ckeditor',
     'channels',
@@ -84,7 +89,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    *(['django.contrib.messages.middleware.MessageMiddleware'] if ENABLE_ADMIN else []),
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     *LOCAL_MIDDLEWARE,
 ]
@@ -100,7 +105,7 @@ TEMPLATES = [
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
+                *(['django.contrib.messages.context_processors.messages'] if ENABLE_ADMIN else []),
                 'config.context_processors.websocket_url',
             ],
         },
@@ -122,8 +127,16 @@ DATABASES = {
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
         'CONN_MAX_AGE': 600,
+        # Persistent connections can be dropped while idle (NAT, PG restart);
+        # check before reuse instead of failing the request's first query.
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'connect_timeout': 10,
+            # TCP keepalives so idle middleboxes don't silently drop the socket.
+            'keepalives': 1,
+            'keepalives_idle': 30,
+            'keepalives_interval': 10,
+            'keepalives_count': 5,
         }
     }
 }
@@ -188,20 +201,19 @@ CKEDITOR_CONFIGS = {
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'apps.common.exception_handlers.holadrive_exception_handler',
+    # The browsable API is a development aid; production serves JSON only.
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'apps.common.renderers.ORJSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.common.authentication.RoleAwareJWTAuthentication',
     ),
     "DEFAULT_PARSER_CLASSES": (
         "apps.common.parsers.LenientJSONParser",
-        "rest_framework.parsers.JSONParser",
         "rest_framework.parsers.FormParser",
         "rest_framework.parsers.MultiPartParser",
-        "rest_framework.parsers.FileUploadParser",
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -412,24 +424,32 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Driver GPS pings are cached in Redis and flushed to the DB by Celery beat
+# (see apps/order/services/driver_location_cache.py, DRIVER_LOCATION_FLUSH_SECONDS).
+DRIVER_LOCATION_REDIS_URL = os.getenv('DRIVER_LOCATION_REDIS_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/1'))
+DRIVER_LOCATION_TTL_SECONDS = int(os.getenv('DRIVER_LOCATION_TTL_SECONDS', '3600'))
+# Readers fall back to the DB when Redis is down; fail fast instead of waiting
+# for the OS TCP timeout on every websocket push.
+DRIVER_LOCATION_REDIS_CONNECT_TIMEOUT = float(os.getenv('DRIVER_LOCATION_REDIS_CONNECT_TIMEOUT', '0.5'))
+DRIVER_LOCATION_REDIS_SOCKET_TIMEOUT = float(os.getenv('DRIVER_LOCATION_REDIS_SOCKET_TIMEOUT', '0.5'))
+
 LOGS_DIR = os.path.join(BASE_DIR, 'logs')
-if not os.path.exists(LOGS_DIR):
-    try:
-        os.makedirs(LOGS_DIR, exist_ok=True)
-    except Exception:
-        pass
+try:
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    LOGS_DIR_OK = True
+except OSError:
+    # Read-only filesystem etc.: log to the console only.
+    LOGS_DIR_OK = False
 
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
         'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{',
+            'format': '%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s',
         },
         'simple': {
-            'format': '{levelname} {message}',
-            'style': '{',
+            'format': '%(levelname)s %(message)s',
         },
     },
     'handlers': {
@@ -445,7 +465,9 @@ LOGGING = {
     'loggers': {
         'django': {
             'handlers': ['console'],
-            'level': 'INFO',
+            # django.request/django.channels INFO records are per-request noise
+            # outside development; warnings and errors still come through.
+            'level': 'INFO' if DEBUG else 'WARNING',
             'propagate': False,
         },
         'apps.accounts': {
@@ -471,9 +493,10 @@ LOGGING = {
     },
 }
 
-if os.path.exists(LOGS_DIR):
+if LOGS_DIR_OK:
     LOGGING['handlers']['file'] = {
-        'class': 'logging.FileHandler',
+        # Writes happen on a QueueListener thread, not the request thread.
+        'class': 'apps.common.log_handlers.QueuedFileHandler',
         'filename': os.path.join(LOGS_DIR, 'django.log'),
         'formatter': 'verbose',
     }
@@ -2,12 +2,15 @@ from django.urls import path, include, re_path
 from django.views.static import serve
 from django.conf import settings
 from django.conf.urls.static import static
-from django.contrib import admin
 from django.http import FileResponse
+from django.views.decorators.cache import cache_page
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 from pathlib import Path
 
 
+SCHEMA_CACHE_SECONDS = 60 * 60
+
+
 def voice_call_test_page(_request):
     """Local HTML tester for rider/driver support calls (same-origin → no CORS)."""
     path = Path(settings.BASE_DIR) / 'voice_call_test.html'
@@ -23,24 +26,37 @@ def agora_sdk_js(_request):
     return FileResponse(path.open('rb'), content_type='application/javascript; charset=utf-8')
 
 
+# Nested under one 'api/v1/' prefix so the resolver rejects non-API paths
+# (and API paths reject everything else) with a single prefix check.
+api_v1_patterns = [
+    path('accounts/', include('apps.accounts.urls')),
+    path('admin-panel/', include('apps.admin_panel.urls')),
+    path('order/', include('apps.order.urls')),
+    path('payment/', include('apps.payment.urls')),
+    path('notification/', include('apps.notification.urls')),
+    path('chat/', include('apps.chat.urls')),
+    path('voice-call/', include('apps.voice_call.urls')),
+]
+
 urlpatterns = [
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/v1/', include(api_v1_patterns)),
+    # The schema only changes on deploy (SERVE_PUBLIC: same for every user);
+    # generating it walks every view and serializer, so serve it from cache.
+    path('api/schema/', cache_page(SCHEMA_CACHE_SECONDS)(SpectacularAPIView.as_view()), name='schema'),
     path('swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     path('voice-call-test/', voice_call_test_page, name='voice-call-test'),
     path('vendor/AgoraRTC_N.js', agora_sdk_js, name='agora-sdk-js'),
-    path('api/v1/accounts/', include('apps.accounts.urls')),
-    path('api/v1/admin-panel/', include('apps.admin_panel.urls')),
-    path('api/v1/order/', include('apps.order.urls')),
-    path('api/v1/payment/', include('apps.payment.urls')),
-    path('api/v1/notification/', include('apps.notification.urls')),
-    path('api/v1/chat/', include('apps.chat.urls')),
-    path('api/v1/voice-call/', include('apps.voice_call.urls')),
-    path('admin/', admin.site.urls),
 ]
 
+if settings.ENABLE_ADMIN:
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
+
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Daphne serves media directly (no proxy in front), so this route is used in
+# every environment; static(MEDIA_URL) would only add the same route in DEBUG.
 urlpatterns += [
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    re_path(r'^media/(?P<path>.+)$', serve, {'document_root': settings.MEDIA_ROOT}),
 ]